@@ -0,0 +1,34 @@
+"""record product index
+
+Revision ID: 3c1e9a4f5d27
+Revises: 7b7dd5ce8b03
+Create Date: 2026-10-18 15:02:37.190455
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1e9a4f5d27"
+down_revision: Union[str, None] = "7b7dd5ce8b03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_record_user_product",
+        "record",
+        ["user_id", sa.text("lower(name) text_pattern_ops"), "record_date"],
+        unique=False,
+    )
+    op.drop_index("idx_product_name", table_name="record")
+
+
+def downgrade() -> None:
+    op.create_index("idx_product_name", "record", ["name"], unique=False)
+    op.drop_index("idx_record_user_product", table_name="record")
@@ -0,0 +1,211 @@
+"""daily record totals
+
+Revision ID: 7b7dd5ce8b03
+Revises: 261fad42c4a0
+Create Date: 2026-10-18 12:10:41.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b7dd5ce8b03"
+down_revision: Union[str, None] = "261fad42c4a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_record_totals",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("record_date", sa.Date(), nullable=False),
+        # numeric: суммы меняются дельтами +/-, в double precision
+        # ошибка округления накапливалась бы с каждым изменением записи
+        sa.Column("amount_sum", sa.Numeric(), nullable=False),
+        sa.Column("amount_qty_sum", sa.Numeric(), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("record_type_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["record_type_id"], ["record_type.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_daily_record_totals",
+        "daily_record_totals",
+        [
+            "user_id",
+            "record_type_id",
+            "record_date",
+            sa.text("coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid)"),
+        ],
+        unique=True,
+    )
+    # Изменение итогов одной записью: дельты по дню, типу и категории
+    op.execute(
+        """
+        CREATE TYPE daily_record_total_delta AS (
+            user_id uuid,
+            record_type_id integer,
+            category_id uuid,
+            record_date date,
+            amount numeric,
+            amount_qty numeric,
+            record_count integer
+        );
+        """
+    )
+    # Применение дельт одним INSERT ... ON CONFLICT; строки, в которых
+    # после вычитания не осталось записей, удаляются
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION daily_record_totals_apply(
+            p_changes daily_record_total_delta[]
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO daily_record_totals (
+                user_id, record_type_id, category_id, record_date,
+                amount_sum, amount_qty_sum, record_count
+            )
+            SELECT
+                user_id, record_type_id, category_id, record_date,
+                sum(amount), coalesce(sum(amount_qty), 0), sum(record_count)
+            FROM unnest(p_changes)
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id, record_type_id, category_id, record_date
+            ON CONFLICT (
+                user_id, record_type_id, record_date,
+                (coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid))
+            )
+            DO UPDATE SET
+                amount_sum = daily_record_totals.amount_sum + EXCLUDED.amount_sum,
+                amount_qty_sum = daily_record_totals.amount_qty_sum + EXCLUDED.amount_qty_sum,
+                record_count = daily_record_totals.record_count + EXCLUDED.record_count;
+
+            DELETE FROM daily_record_totals t
+            USING (
+                SELECT DISTINCT user_id, record_type_id, category_id, record_date
+                FROM unnest(p_changes)
+                WHERE record_count < 0
+            ) c
+            WHERE t.user_id = c.user_id
+              AND t.record_type_id = c.record_type_id
+              AND t.record_date = c.record_date
+              AND t.category_id IS NOT DISTINCT FROM c.category_id
+              AND t.record_count <= 0;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Триггеры уровня оператора: изменения пакета записей собираются из
+    # таблиц переходов и применяются к итогам один раз. При UPDATE
+    # учитываются только записи, у которых изменились поля итогов
+    # (например, синхронизация tag_ids итоги не трогает).
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION daily_record_totals_trigger() RETURNS trigger AS $$
+        DECLARE
+            changes daily_record_total_delta[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(ROW(
+                    user_id, record_type_id, category_id, record_date,
+                    amount::numeric, amount::numeric * product_quantity, 1
+                )::daily_record_total_delta)
+                INTO changes
+                FROM new_records;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(ROW(
+                    user_id, record_type_id, category_id, record_date,
+                    -amount::numeric, -(amount::numeric * product_quantity), -1
+                )::daily_record_total_delta)
+                INTO changes
+                FROM old_records;
+            ELSE
+                SELECT array_agg(v.delta)
+                INTO changes
+                FROM old_records o
+                JOIN new_records n ON n.id = o.id
+                CROSS JOIN LATERAL (VALUES
+                    (ROW(
+                        o.user_id, o.record_type_id, o.category_id, o.record_date,
+                        -o.amount::numeric, -(o.amount::numeric * o.product_quantity), -1
+                    )::daily_record_total_delta),
+                    (ROW(
+                        n.user_id, n.record_type_id, n.category_id, n.record_date,
+                        n.amount::numeric, n.amount::numeric * n.product_quantity, 1
+                    )::daily_record_total_delta)
+                ) v(delta)
+                WHERE (o.user_id, o.record_type_id, o.category_id, o.record_date,
+                       o.amount, o.product_quantity)
+                      IS DISTINCT FROM
+                      (n.user_id, n.record_type_id, n.category_id, n.record_date,
+                       n.amount, n.product_quantity);
+            END IF;
+
+            IF changes IS NOT NULL THEN
+                PERFORM daily_record_totals_apply(changes);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_daily_totals_insert
+        AFTER INSERT ON record
+        REFERENCING NEW TABLE AS new_records
+        FOR EACH STATEMENT EXECUTE FUNCTION daily_record_totals_trigger();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_daily_totals_update
+        AFTER UPDATE ON record
+        REFERENCING OLD TABLE AS old_records NEW TABLE AS new_records
+        FOR EACH STATEMENT EXECUTE FUNCTION daily_record_totals_trigger();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_daily_totals_delete
+        AFTER DELETE ON record
+        REFERENCING OLD TABLE AS old_records
+        FOR EACH STATEMENT EXECUTE FUNCTION daily_record_totals_trigger();
+        """
+    )
+    # Заполнение итогов по уже существующим записям
+    op.execute(
+        """
+        INSERT INTO daily_record_totals (
+            user_id, record_type_id, category_id, record_date,
+            amount_sum, amount_qty_sum, record_count
+        )
+        SELECT
+            user_id, record_type_id, category_id, record_date,
+            sum(amount::numeric),
+            coalesce(sum(amount::numeric * product_quantity), 0),
+            count(*)
+        FROM record
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, record_type_id, category_id, record_date;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS record_daily_totals_delete ON record;")
+    op.execute("DROP TRIGGER IF EXISTS record_daily_totals_update ON record;")
+    op.execute("DROP TRIGGER IF EXISTS record_daily_totals_insert ON record;")
+    op.execute("DROP FUNCTION IF EXISTS daily_record_totals_trigger();")
+    op.execute("DROP FUNCTION IF EXISTS daily_record_totals_apply(daily_record_total_delta[]);")
+    op.execute("DROP TYPE IF EXISTS daily_record_total_delta;")
+    op.drop_index("uq_daily_record_totals", table_name="daily_record_totals")
+    op.drop_table("daily_record_totals")
@@ -0,0 +1,129 @@
+"""balance checkpoint
+
+Revision ID: a5d2c8e71f04
+Revises: 3c1e9a4f5d27
+Create Date: 2026-10-18 16:21:08.532914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a5d2c8e71f04"
+down_revision: Union[str, None] = "3c1e9a4f5d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "balance_checkpoint",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("cumulative_sum", sa.Numeric(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("record_type_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["record_type_id"], ["record_type.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_balance_checkpoint",
+        "balance_checkpoint",
+        [
+            "user_id",
+            "month",
+            "record_type_id",
+            sa.text("coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid)"),
+        ],
+        unique=True,
+    )
+    # Любое изменение дневных итогов сбрасывает контрольные точки с месяца
+    # самой ранней измененной даты. Триггеры уровня оператора обрабатывают
+    # таблицы переходов один раз: по каждому пользователю одна блокировка и
+    # одно удаление. Блокировка строки пользователя FOR SHARE не дает
+    # построению точек (FOR NO KEY UPDATE) прочитать итоги до фиксации
+    # изменения и сохранить устаревшие значения; строки блокируются в
+    # порядке id, чтобы параллельные пакеты не взаимоблокировались.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION balance_checkpoint_invalidate() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM 1 FROM "user"
+                WHERE id IN (SELECT user_id FROM old_totals)
+                ORDER BY id
+                FOR SHARE;
+                DELETE FROM balance_checkpoint b
+                USING (
+                    SELECT user_id, min(date_trunc('month', record_date))::date AS month
+                    FROM old_totals
+                    GROUP BY user_id
+                ) c
+                WHERE b.user_id = c.user_id AND b.month >= c.month;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM 1 FROM "user"
+                WHERE id IN (SELECT user_id FROM new_totals)
+                ORDER BY id
+                FOR SHARE;
+                DELETE FROM balance_checkpoint b
+                USING (
+                    SELECT user_id, min(date_trunc('month', record_date))::date AS month
+                    FROM new_totals
+                    GROUP BY user_id
+                ) c
+                WHERE b.user_id = c.user_id AND b.month >= c.month;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER daily_record_totals_balance_checkpoint_insert
+        AFTER INSERT ON daily_record_totals
+        REFERENCING NEW TABLE AS new_totals
+        FOR EACH STATEMENT EXECUTE FUNCTION balance_checkpoint_invalidate();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER daily_record_totals_balance_checkpoint_update
+        AFTER UPDATE ON daily_record_totals
+        REFERENCING OLD TABLE AS old_totals NEW TABLE AS new_totals
+        FOR EACH STATEMENT EXECUTE FUNCTION balance_checkpoint_invalidate();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER daily_record_totals_balance_checkpoint_delete
+        AFTER DELETE ON daily_record_totals
+        REFERENCING OLD TABLE AS old_totals
+        FOR EACH STATEMENT EXECUTE FUNCTION balance_checkpoint_invalidate();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS daily_record_totals_balance_checkpoint_delete "
+        "ON daily_record_totals;"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS daily_record_totals_balance_checkpoint_update "
+        "ON daily_record_totals;"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS daily_record_totals_balance_checkpoint_insert "
+        "ON daily_record_totals;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS balance_checkpoint_invalidate();")
+    op.drop_index("uq_balance_checkpoint", table_name="balance_checkpoint")
+    op.drop_table("balance_checkpoint")
@@ -0,0 +1,79 @@
+"""user scoped indexes
+
+Revision ID: c84f0e2b9a61
+Revises: a5d2c8e71f04
+Create Date: 2026-10-18 17:40:12.804117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c84f0e2b9a61"
+down_revision: Union[str, None] = "a5d2c8e71f04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CREATE INDEX CONCURRENTLY не выполняется внутри транзакции
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_record_user_type_date",
+            "record",
+            ["user_id", "record_type_id", "record_date", "id"],
+            unique=False,
+            postgresql_include=["category_id", "amount", "product_quantity"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_record_tag_tag",
+            "record_tag",
+            ["tag_id", "record_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_category_user_type",
+            "category",
+            ["user_id", "record_type_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_tag_user_type",
+            "tag",
+            ["user_id", "record_type_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_unit_user",
+            "unit",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in (
+            ("idx_unit_user", "unit"),
+            ("idx_tag_user_type", "tag"),
+            ("idx_category_user_type", "category"),
+            ("idx_record_tag_tag", "record_tag"),
+            ("idx_record_user_type_date", "record"),
+        ):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,44 @@
+"""record name trgm
+
+Revision ID: e17b4d09c3a8
+Revises: c84f0e2b9a61
+Create Date: 2026-10-18 18:55:46.017342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e17b4d09c3a8"
+down_revision: Union[str, None] = "c84f0e2b9a61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_record_name_trgm",
+            "record",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_record_name_trgm",
+            table_name="record",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
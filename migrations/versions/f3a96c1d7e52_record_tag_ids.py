@@ -0,0 +1,124 @@
+"""record tag ids
+
+Revision ID: f3a96c1d7e52
+Revises: e17b4d09c3a8
+Create Date: 2026-10-18 20:12:30.671829
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a96c1d7e52"
+down_revision: Union[str, None] = "e17b4d09c3a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "record",
+        sa.Column(
+            "tag_ids",
+            postgresql.ARRAY(sa.UUID()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+    # Изменения record_tag (включая каскадные удаления записей и тегов)
+    # применяются к record.tag_ids дельтой по таблицам переходов, поэтому
+    # параллельные добавления тегов одной записи не теряют друг друга
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_tag_ids_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE record r
+                SET tag_ids = ARRAY(
+                    SELECT unnest(r.tag_ids) EXCEPT SELECT unnest(d.ids)
+                )
+                FROM (
+                    SELECT record_id, array_agg(tag_id) AS ids
+                    FROM deleted_tags
+                    GROUP BY record_id
+                ) d
+                WHERE r.id = d.record_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE record r
+                SET tag_ids = ARRAY(
+                    SELECT unnest(r.tag_ids) UNION SELECT unnest(i.ids)
+                )
+                FROM (
+                    SELECT record_id, array_agg(tag_id) AS ids
+                    FROM inserted_tags
+                    GROUP BY record_id
+                ) i
+                WHERE r.id = i.record_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_tag_ids_insert
+        AFTER INSERT ON record_tag
+        REFERENCING NEW TABLE AS inserted_tags
+        FOR EACH STATEMENT EXECUTE FUNCTION record_tag_ids_sync();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_tag_ids_update
+        AFTER UPDATE ON record_tag
+        REFERENCING OLD TABLE AS deleted_tags NEW TABLE AS inserted_tags
+        FOR EACH STATEMENT EXECUTE FUNCTION record_tag_ids_sync();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER record_tag_ids_delete
+        AFTER DELETE ON record_tag
+        REFERENCING OLD TABLE AS deleted_tags
+        FOR EACH STATEMENT EXECUTE FUNCTION record_tag_ids_sync();
+        """
+    )
+    # Заполнение по уже существующим связям
+    op.execute(
+        """
+        UPDATE record r
+        SET tag_ids = t.ids
+        FROM (
+            SELECT record_id, array_agg(tag_id) AS ids
+            FROM record_tag
+            GROUP BY record_id
+        ) t
+        WHERE r.id = t.record_id;
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_record_tag_ids",
+            "record",
+            ["tag_ids"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_record_tag_ids", table_name="record")
+    op.execute("DROP TRIGGER IF EXISTS record_tag_ids_delete ON record_tag;")
+    op.execute("DROP TRIGGER IF EXISTS record_tag_ids_update ON record_tag;")
+    op.execute("DROP TRIGGER IF EXISTS record_tag_ids_insert ON record_tag;")
+    op.execute("DROP FUNCTION IF EXISTS record_tag_ids_sync();")
+    op.drop_column("record", "tag_ids")
@@ -0,0 +1,74 @@
+"""
+Проверка планов горячих запросов на рабочей копии БД.
+
+Для каждого запроса из src.database.explain.hot_queries строится план
+с настройками планировщика по умолчанию; если в нем нет ни одного из
+ожидаемых индексов (EXPECTED_INDEXES), проверка завершается с кодом 1.
+
+Запуск из корня проекта: python -m scripts.check_query_plans [--user USER_ID]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.core.db import async_session_maker
+from src.database.explain import EXPECTED_INDEXES, explain, hot_queries, used_indexes
+from src.models import Record, RecordTag
+
+logger = logging.getLogger("check_query_plans")
+
+
+async def check_plans(session: AsyncSession, user_id: uuid.UUID | None) -> bool:
+    """
+    Проверка всех горячих запросов.
+
+    :param user_id: UUID пользователя или None (первый пользователь с записями)
+    :return: True, если каждый запрос использует ожидаемый индекс
+    """
+    if user_id is None:
+        user_id = await session.scalar(
+            select(Record.user_id).where(Record.user_id.is_not(None)).limit(1)
+        )
+        if user_id is None:
+            logger.error("Нет записей для проверки")
+            return False
+    tag_id = await session.scalar(
+        select(RecordTag.tag_id)
+        .join(Record, RecordTag.record_id == Record.id)
+        .where(Record.user_id == user_id)
+        .limit(1)
+    )
+
+    ok = True
+    for name, build in hot_queries(user_id, tag_id or uuid.uuid4()).items():
+        used = used_indexes(await explain(session, build()))
+        if used & EXPECTED_INDEXES[name]:
+            logger.info("ok   %s: %s", name, ", ".join(sorted(used)))
+        else:
+            ok = False
+            logger.error(
+                "FAIL %s: expected %s, used %s",
+                name,
+                " or ".join(sorted(EXPECTED_INDEXES[name])),
+                ", ".join(sorted(used)) or "no indexes",
+            )
+    await session.rollback()
+    return ok
+
+
+async def main(user_id: uuid.UUID | None) -> int:
+    async with async_session_maker() as session:
+        return 0 if await check_plans(session, user_id) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Проверка планов горячих запросов")
+    parser.add_argument("--user", type=uuid.UUID, default=None, help="UUID пользователя")
+    sys.exit(asyncio.run(main(parser.parse_args().user)))
@@ -1,20 +1,63 @@
-from fastapi_users import FastAPIUsers
+from typing import Optional
+
+import jwt
+from fastapi_users import BaseUserManager, FastAPIUsers, exceptions
 from fastapi_users.authentication import (
     AuthenticationBackend,
     CookieTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt
 
 from src.config import SECRET_AUTH
 from src.models import User
 
+from .cache import user_cache
 from .manager import get_user_manager
 
 cookie_transport = CookieTransport(cookie_name="fm", cookie_max_age=10800)
 
 
+class CachedJWTStrategy(JWTStrategy):
+    """
+    JWT-стратегия с кэшем пользователей по токену.
+
+    Подпись и срок действия токена проверяются на каждом запросе,
+    а загрузка пользователя из БД выполняется только при промахе кэша.
+    """
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager
+    ) -> Optional[User]:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+        except jwt.PyJWTError:
+            return None
+
+        cached = user_cache.get(token)
+        if cached is not None:
+            # Копия снимка в сессии запроса, без обращения к БД
+            return await user_manager.user_db.session.merge(cached, load=False)
+
+        try:
+            user = await user_manager.get(user_manager.parse_id(user_id))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        user_cache.set(token, user)
+        return user
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=SECRET_AUTH, lifetime_seconds=10800)
+    return CachedJWTStrategy(secret=SECRET_AUTH, lifetime_seconds=10800)
 
 
 auth_backend = AuthenticationBackend(
@@ -0,0 +1,43 @@
+import hashlib
+import uuid
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.cache.memory import MemoryCache
+from src.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from src.models import User
+
+
+class UserCache:
+    """
+    Кэш пользователей, определенных по JWT-токену.
+
+    Хранит отсоединенные снимки User без привязки к сессии, чтобы один
+    объект не разделялся между запросами. Записи живут не дольше TTL
+    и явно вытесняются при изменении или удалении пользователя.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = MemoryCache(maxsize, ttl)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> User | None:
+        return self._cache.get(self._key(token))
+
+    def set(self, token: str, user: User):
+        snapshot = User(
+            **{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        )
+        make_transient_to_detached(snapshot)
+        self._cache.set(self._key(token), snapshot)
+
+    def evict_user(self, user_id: uuid.UUID):
+        """Удаление всех токенов пользователя из кэша"""
+        self._cache.delete_where(lambda _, user: user.id == user_id)
+
+
+user_cache = UserCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
@@ -0,0 +1,136 @@
+import json
+import math
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from src.cache.memory import MemoryCache
+from src.config import CACHE_SIZE, CACHE_TTL, REDIS_URL
+
+
+def rebuild_key(key: str) -> str:
+    """Ключ поколения пересчетов счетчика key (см. CacheBackend.adjust)"""
+    return f"{key}:rebuild"
+
+
+def check_ttl(ttl: float) -> float:
+    """
+    Проверка времени жизни записи.
+
+    :param ttl: Время жизни в секундах (может быть дробным)
+    :return: ttl, если это положительное конечное число
+    """
+    if not (0 < ttl < math.inf):
+        raise ValueError(f"TTL must be a positive finite number of seconds, got {ttl!r}")
+    return ttl
+
+
+class CacheBackend:
+    """
+    Интерфейс хранилища кэша.
+
+    Значения должны сериализоваться в JSON. TTL задается в секундах и
+    может быть дробным, неположительный TTL отклоняется (ValueError)
+    одинаково во всех хранилищах. Счетчики incr, которых еще
+    нет в хранилище, начинаются с текущего времени в наносекундах, чтобы
+    после вытеснения ключа версия не вернулась к уже использованному
+    значению.
+    """
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float | None = None): ...
+
+    async def delete(self, key: str): ...
+
+    async def incr(self, key: str, amount: int = 1) -> int: ...
+
+    async def adjust(self, key: str, amount: int) -> int | None:
+        """
+        Изменение существующего счетчика без продления его TTL.
+
+        В отличие от incr отсутствующий ключ не создается: возвращается
+        None, и значение строится заново при следующем чтении. Вместе с
+        этим атомарно увеличивается поколение rebuild_key(key), по
+        которому пересчет, начатый до изменения, узнает, что его результат
+        устарел.
+        """
+
+    async def get_version(self, key: str) -> int:
+        """Текущее значение счетчика версии (создается при отсутствии)"""
+        version = await self.get(key)
+        if version is None:
+            version = await self.incr(key, 0)
+        return version
+
+
+class MemoryBackend(CacheBackend):
+    """Кэш в памяти процесса (LRU + TTL)"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self._cache = MemoryCache(maxsize, check_ttl(ttl))
+
+    async def get(self, key: str) -> Any | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        self._cache.set(key, value, check_ttl(self._cache.ttl if ttl is None else ttl))
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = self._cache.get(key)
+        value = (time.time_ns() if value is None else value) + amount
+        self._cache.set(key, value, float("inf"))
+        return value
+
+    async def adjust(self, key: str, amount: int) -> int | None:
+        value = self._cache.adjust(key, amount)
+        if value is None:
+            await self.incr(rebuild_key(key))
+        return value
+
+
+# INCRBY только для существующего ключа (TTL ключа сохраняется),
+# при отсутствии ключа - увеличение поколения пересчетов (как в incr)
+ADJUST_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('incrby', KEYS[1], ARGV[1])
+end
+redis.call('set', KEYS[2], ARGV[2], 'NX')
+redis.call('incr', KEYS[2])
+return nil
+"""
+
+
+class RedisBackend(CacheBackend):
+    """Кэш в Redis, общий для всех воркеров приложения"""
+
+    def __init__(self, url: str, ttl: float = CACHE_TTL):
+        self._redis = redis.from_url(url)
+        self._adjust = self._redis.register_script(ADJUST_SCRIPT)
+        self.ttl = check_ttl(ttl)
+
+    async def get(self, key: str) -> Any | None:
+        value = await self._redis.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        ttl = check_ttl(self.ttl if ttl is None else ttl)
+        # PX в миллисекундах: дробный TTL не округляется до недопустимого 0
+        await self._redis.set(key, json.dumps(value), px=math.ceil(ttl * 1000))
+
+    async def delete(self, key: str):
+        await self._redis.delete(key)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        await self._redis.set(key, time.time_ns(), nx=True)
+        return await self._redis.incrby(key, amount)
+
+    async def adjust(self, key: str, amount: int) -> int | None:
+        return await self._adjust(keys=[key, rebuild_key(key)], args=[amount, time.time_ns()])
+
+
+cache_backend: CacheBackend = RedisBackend(REDIS_URL) if REDIS_URL else MemoryBackend()
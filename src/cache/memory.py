@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class MemoryCache:
+    """
+    LRU-кэш в памяти процесса с TTL записей и ограничением размера.
+
+    При превышении maxsize вытесняются давно не использованные записи,
+    просроченные записи удаляются при обращении к ним.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: Максимальное количество записей
+        :param ttl: Время жизни записи по умолчанию в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получение значения с продлением позиции в LRU"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """Сохранение значения с вытеснением самых старых записей"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def adjust(self, key: Hashable, amount: int) -> int | None:
+        """Изменение числового значения без продления TTL (None, если записи нет)"""
+        if self.get(key) is None:
+            return None
+        expires_at, value = self._data[key]
+        self._data[key] = (expires_at, value + amount)
+        return value + amount
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """Удаление всех записей, для которых predicate(key, value) истинен"""
+        for key in [key for key, (_, value) in self._data.items() if predicate(key, value)]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,22 @@
+import uuid
+
+from src.cache.backends import cache_backend
+
+
+def data_version_key(user_id: uuid.UUID) -> str:
+    return f"data:{user_id}:version"
+
+
+async def get_data_version(user_id: uuid.UUID) -> int:
+    """Текущая версия данных пользователя"""
+    return await cache_backend.get_version(data_version_key(user_id))
+
+
+async def bump_data_version(user_id: uuid.UUID) -> int:
+    """
+    Увеличение версии данных пользователя.
+
+    Вызывается после любого изменения записей или справочников, все
+    результаты, закэшированные с прежней версией, перестают читаться.
+    """
+    return await cache_backend.incr(data_version_key(user_id))
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -13,3 +14,27 @@ DB_NAME = os.environ.get("DB_NAME")
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 SECRET_AUTH = os.environ.get("SECRET_AUTH")
+AUTH_CACHE_TTL = int(os.environ.get("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_SIZE = int(os.environ.get("AUTH_CACHE_SIZE", 10000))
+
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 300))
+CACHE_SIZE = int(os.environ.get("CACHE_SIZE", 10000))
+STATS_CACHE_TTL = int(os.environ.get("STATS_CACHE_TTL", 600))
+COUNT_CACHE_TTL = int(os.environ.get("COUNT_CACHE_TTL", 3600))
+STATS_DASHBOARD_CONCURRENCY = int(os.environ.get("STATS_DASHBOARD_CONCURRENCY", 4))
+
+AUTOCOMPLETE_NAMES = int(os.environ.get("AUTOCOMPLETE_NAMES", 500))
+AUTOCOMPLETE_CACHE_SIZE = int(os.environ.get("AUTOCOMPLETE_CACHE_SIZE", 1000))
+AUTOCOMPLETE_CACHE_TTL = int(os.environ.get("AUTOCOMPLETE_CACHE_TTL", 3600))
+
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 1000))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", 2))
+# reportlab строит документ в памяти: предел строк одного PDF
+PDF_MAX_ROWS = int(os.environ.get("PDF_MAX_ROWS", 20000))
+
+EXPORT_DIR = os.environ.get("EXPORT_DIR") or os.path.join(
+    tempfile.gettempdir(), "finance_manager_exports"
+)
+EXPORT_JOB_WORKERS = int(os.environ.get("EXPORT_JOB_WORKERS", 2))
+EXPORT_RESULT_TTL = int(os.environ.get("EXPORT_RESULT_TTL", 3600))
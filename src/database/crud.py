@@ -1,7 +1,7 @@
 from typing import Any
 from uuid import UUID
 from src.database.core.db import Base
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import MappedClassProtocol, selectinload
 
@@ -17,20 +17,24 @@ async def select_data(
     order_by = None
 ):
     load_options = [selectinload(rel) for rel in selectload]
-    query = (
-        select(model).where(*filters).limit(limit).options(*load_options)
-    )
+    query = select(model).where(*filters).options(*load_options)
     if not no_limit:
-        query = query.offset(skip)
+        query = query.limit(limit).offset(skip)
    
     if order_by is not None:
-        query = query.order_by(order_by)
+        if not isinstance(order_by, (list, tuple)):
+            order_by = [order_by]
+        query = query.order_by(*order_by)
         
 
     result = await session.execute(query)
     return result.scalars().all()
 
 
+async def count_data(session: AsyncSession, model: type[Base], filters: list = []) -> int:
+    return await session.scalar(select(func.count()).select_from(model).where(*filters))
+
+
 async def insert_data(
     session: AsyncSession,
     model: MappedClassProtocol,
@@ -43,6 +47,29 @@ async def insert_data(
         await session.commit()
 
 
+# Предел количества параметров одного запроса в протоколе PostgreSQL
+MAX_BIND_PARAMS = 32767
+
+
+async def insert_rows(
+    session: AsyncSession,
+    model: MappedClassProtocol,
+    values: list[dict],
+    commit: bool = True,
+):
+    # Многострочные INSERT ... VALUES пакетами под предел параметров:
+    # каждый пакет - один оператор, триггеры уровня оператора
+    # срабатывают один раз на пакет, а не на каждую строку. Размер
+    # пакета считается по всем колонкам таблицы: значения по умолчанию
+    # на стороне Python тоже передаются параметрами
+    if values:
+        chunk_size = MAX_BIND_PARAMS // len(model.__table__.columns)
+        for start in range(0, len(values), chunk_size):
+            await session.execute(insert(model).values(values[start:start + chunk_size]))
+    if commit:
+        await session.commit()
+
+
 async def upload_data(
     session: AsyncSession, model: MappedClassProtocol, names: list = []
 ):
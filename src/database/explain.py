@@ -0,0 +1,123 @@
+"""
+Планы горячих запросов и индексы, которые они должны использовать.
+
+План запроса строится EXPLAIN (FORMAT JSON) с настройками планировщика
+по умолчанию, поэтому проверка имеет смысл только на БД с реалистичным
+объемом данных и собранной статистикой: тестовой (tests/test_query_plans.py)
+или рабочей копии (scripts/check_query_plans.py).
+"""
+
+import uuid
+from datetime import date
+from typing import Any, Callable
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from src.models import Category, Record, Tag, Unit
+from src.records.records.queries import export_rows_stmt, record_list_stmt
+from src.schemas import TrendBodyDTO
+from src.stats.database import categories_month_stmt, month_aggregates, trend_query
+
+# Тип записи, для которого строятся запросы (расходы)
+RECORD_TYPE_ID = 1
+RECORD_TYPE_NAME = "expense"
+
+
+def hot_queries(user_id: uuid.UUID, tag_id: uuid.UUID) -> dict[str, Callable[[], Any]]:
+    """
+    Запросы, выполняемые на каждом открытии страниц приложения.
+
+    :param user_id: UUID пользователя
+    :param tag_id: UUID тега пользователя (для фильтра по тегу)
+    :return: Словарь {название: функция построения запроса}
+    """
+    filters = [Record.record_type_id == RECORD_TYPE_ID, Record.user_id == user_id]
+    order_by = [Record.record_date.desc(), Record.id.desc()]
+    today = date.today()
+    period = {"start_date": today - relativedelta(years=1), "end_date": today}
+
+    return {
+        "record list": lambda: record_list_stmt(filters, order_by).limit(100),
+        "record list (cursor)": lambda: record_list_stmt(
+            [*filters, tuple_(Record.record_date, Record.id) < tuple_(today, uuid.uuid4())],
+            order_by,
+        ).limit(100),
+        "export": lambda: export_rows_stmt(filters, order_by),
+        "month stats": lambda: categories_month_stmt(
+            user_id,
+            RECORD_TYPE_NAME,
+            today.month,
+            today.year,
+            month_aggregates(RECORD_TYPE_NAME)["sum"],
+        ),
+        "trend": lambda: trend_query(
+            user_id, RECORD_TYPE_NAME, TrendBodyDTO(**period, granularity="month")
+        )[0],
+        "trend (tag filter)": lambda: trend_query(
+            user_id,
+            RECORD_TYPE_NAME,
+            TrendBodyDTO(**period, granularity="month", tags=[tag_id]),
+        )[0],
+        "categories": lambda: select(Category).where(
+            Category.user_id == user_id, Category.record_type_id == RECORD_TYPE_ID
+        ),
+        "tags": lambda: select(Tag).where(
+            Tag.user_id == user_id, Tag.record_type_id == RECORD_TYPE_ID
+        ),
+        "units": lambda: select(Unit).where(Unit.user_id == user_id),
+    }
+
+
+# Индексы основной таблицы запроса, хотя бы один из которых должен быть в
+# плане (миграции c84f0e2b9a61, 7b7dd5ce8b03 и f3a96c1d7e52)
+EXPECTED_INDEXES = {
+    "record list": {"idx_record_user_type_date"},
+    "record list (cursor)": {"idx_record_user_type_date"},
+    "export": {"idx_record_user_type_date"},
+    "month stats": {"uq_daily_record_totals"},
+    "trend": {"uq_daily_record_totals"},
+    "trend (tag filter)": {"idx_record_user_type_date", "idx_record_tag_ids"},
+    "categories": {"idx_category_user_type"},
+    "tags": {"idx_tag_user_type"},
+    "units": {"idx_unit_user"},
+}
+
+
+def used_indexes(plan: dict) -> set[str]:
+    """Имена индексов во всех узлах плана, включая подпланы"""
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        indexes |= used_indexes(child)
+    return indexes
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) запроса.
+
+    Запрос компилируется тем же компилятором, что и при обычном
+    выполнении, поэтому параметры передаются драйверу с типами колонок
+    (например, uuid[] для фильтра по тегам), а не литералами.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+async def explain(session: AsyncSession, stmt) -> dict:
+    """План запроса в формате JSON (корневой узел)"""
+    result = await session.execute(Explain(stmt))
+    return result.scalar()[0]["Plan"]
+
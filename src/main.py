@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 import src.routers as ar
+from src.records.records.jobs import export_jobs
+from src.records.records.reports import shutdown_pdf_executor
 
 app = FastAPI()
 
@@ -19,7 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"]
+    expose_headers=["Content-Disposition", "X-Next-Cursor", "X-Total-Count"]
 )
 
 app.include_router(ar.auth_router)
@@ -30,6 +32,9 @@ app.include_router(ar.categories_router)
 app.include_router(ar.records_router)
 app.include_router(ar.stats_router)
 
+app.add_event_handler("shutdown", export_jobs.shutdown)
+app.add_event_handler("shutdown", shutdown_pdf_executor)
+
 
 if __name__ == "__main__":
     uvicorn.run(app=app, reload=True)
@@ -3,3 +3,4 @@ from src.records.categories.models import Category
 from src.records.records.models import Record, RecordType
 from src.records.tags.models import Tag, RecordTag
 from src.records.units.models import Unit
+from src.stats.models import BalanceCheckpoint, DailyRecordTotal
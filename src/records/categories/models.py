@@ -39,6 +39,7 @@ class Category(Base):
             "idx_category_name_user", "name", "user_id", "record_type_id", unique=True
         ),
         Index("idx_category_color_user", "color", "user_id"),
+        Index("idx_category_user_type", "user_id", "record_type_id"),
     )
 
     def to_dto(self):
@@ -18,6 +18,7 @@ class ExpenseCategoryRouter(
             prefix="/expense_categories",
             tags=["categories"],
             record_type_id=1,
+            cache=True,
         )
 
 
@@ -33,6 +34,7 @@ class IncomeCategoryRouter(
             prefix="/income_categories",
             tags=["categories"],
             record_type_id=2,
+            cache=True,
         )
 
 
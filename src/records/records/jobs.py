@@ -0,0 +1,136 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from src.config import EXPORT_DIR, EXPORT_JOB_WORKERS, EXPORT_RESULT_TTL
+from src.schemas import ExportJobDTO
+
+
+class ExportJob:
+    """Задача фоновой генерации файла экспорта"""
+
+    def __init__(self, user_id: uuid.UUID, record_type_id: int, extension: str):
+        self.id = uuid.uuid4()
+        self.user_id = user_id
+        self.record_type_id = record_type_id
+        self.extension = extension
+        self.status = "pending"
+        self.processed = 0
+        self.total: int | None = None
+        self.error: str | None = None
+        self.created_at = datetime.now()
+        self.finished_at: datetime | None = None
+        self.path = os.path.join(EXPORT_DIR, f"{self.id}.{extension}")
+
+    @property
+    def expires_at(self) -> datetime | None:
+        if self.finished_at is None:
+            return None
+        return self.finished_at + timedelta(seconds=EXPORT_RESULT_TTL)
+
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= datetime.now()
+
+    def to_dto(self) -> ExportJobDTO:
+        if self.status == "done":
+            progress = 1.0
+        elif self.total:
+            progress = min(self.processed / self.total, 1.0)
+        else:
+            progress = 0.0
+        return ExportJobDTO(
+            id=self.id,
+            extension=self.extension,
+            status=self.status,
+            processed=self.processed,
+            total=self.total,
+            progress=progress,
+            error=self.error,
+            created_at=self.created_at,
+            expires_at=self.expires_at,
+        )
+
+
+class ExportJobStore:
+    """
+    Локальное хранилище задач экспорта и их результатов.
+
+    Задачи выполняются в текущем процессе как asyncio-задачи, одновременно
+    не более workers штук. Готовые файлы лежат в EXPORT_DIR и удаляются
+    по истечении TTL при следующем обращении к хранилищу.
+    """
+
+    def __init__(self, workers: int = EXPORT_JOB_WORKERS):
+        self._jobs: dict[uuid.UUID, ExportJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(workers)
+
+    def submit(
+        self, job: ExportJob, run: Callable[[ExportJob], Awaitable[None]]
+    ) -> ExportJob:
+        """
+        Постановка задачи в очередь.
+
+        :param job: Новая задача
+        :param run: Корутина, записывающая файл в job.path и обновляющая прогресс
+        :return: Зарегистрированная задача
+        """
+        self.purge_expired()
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._execute(job, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(
+        self, job_id: uuid.UUID, user_id: uuid.UUID, record_type_id: int
+    ) -> ExportJob | None:
+        """Получение задачи с проверкой владельца и типа записи"""
+        self.purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id or job.record_type_id != record_type_id:
+            return None
+        return job
+
+    def purge_expired(self):
+        """Удаление задач и файлов с истекшим TTL"""
+        for job in [job for job in self._jobs.values() if job.is_expired()]:
+            self._remove(job)
+
+    async def shutdown(self):
+        """Отмена незавершенных задач и удаление всех результатов"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in list(self._jobs.values()):
+            self._remove(job)
+
+    async def _execute(self, job: ExportJob, run: Callable[[ExportJob], Awaitable[None]]):
+        async with self._semaphore:
+            job.status = "running"
+            try:
+                await run(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self._unlink(job.path)
+            finally:
+                job.finished_at = datetime.now()
+
+    def _remove(self, job: ExportJob):
+        self._jobs.pop(job.id, None)
+        self._unlink(job.path)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+export_jobs = ExportJobStore()
@@ -2,7 +2,8 @@ import uuid
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import UUID, CheckConstraint, ForeignKey, Index, String, Integer
+from sqlalchemy import UUID, CheckConstraint, ForeignKey, Index, String, Integer, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 import src.database.core.mapped_types as mt
@@ -53,6 +54,11 @@ class Record(Base):
     record_type_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("record_type.id"), nullable=False
     )
+    # Денормализованные id тегов из record_tag, поддерживаются триггерами
+    # на record_tag (миграция record_tag_ids); только для чтения
+    tag_ids: Mapped[list[uuid.UUID]] = mapped_column(
+        ARRAY(UUID), nullable=False, server_default=text("'{}'")
+    )
 
     record_type: Mapped["RecordType"] = relationship(
         "RecordType", back_populates="records", lazy="selectin"
@@ -79,7 +85,27 @@ class Record(Base):
 
     __table_args__ = (
         Index("idx_record_date", "record_date"),
-        Index("idx_product_name", "name"),
+        Index("idx_record_tag_ids", "tag_ids", postgresql_using="gin"),
+        Index(
+            "idx_record_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_record_user_type_date",
+            "user_id",
+            "record_type_id",
+            "record_date",
+            "id",
+            postgresql_include=["category_id", "amount", "product_quantity"],
+        ),
+        Index(
+            "idx_record_user_product",
+            "user_id",
+            text("lower(name) text_pattern_ops"),
+            "record_date",
+        ),
         CheckConstraint("amount >= 0", name="check_product_amount"),
     )
 
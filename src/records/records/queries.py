@@ -0,0 +1,173 @@
+from typing import AsyncIterator, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Row, RowMapping, any_, func, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import EXPORT_CHUNK_SIZE
+from src.models import Category, Record, Tag, Unit
+
+# pg_trgm не извлекает триграммы из более коротких строк
+TRGM_MIN_LENGTH = 3
+
+
+def escape_like(value: str) -> str:
+    """Экранирование спецсимволов LIKE (экранирующий символ - обратная косая черта)"""
+    for char in ("\\", "%", "_"):
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+def name_search_filter(query: str):
+    """
+    Условие поиска записей по части названия без учета регистра.
+
+    ILIKE '%...%' обслуживается GIN-индексом pg_trgm по name. Строки
+    короче TRGM_MIN_LENGTH индекс сузить не может, поэтому по ним
+    ищутся названия, начинающиеся с query (индекс по lower(name)).
+    """
+    if len(query) < TRGM_MIN_LENGTH:
+        return func.lower(Record.name).like(f"{escape_like(query.lower())}%", escape="\\")
+    return Record.name.ilike(f"%{escape_like(query)}%", escape="\\")
+
+
+def export_rows_stmt(filters: list, order_by: list):
+    """
+    Плоский запрос строк для экспорта без загрузки ORM-объектов.
+
+    Категория и единица подтягиваются JOIN-ами, теги склеиваются в строку
+    коррелированным подзапросом по record.tag_ids.
+
+    :param filters: Фильтры SQLAlchemy (пользователь, тип записи)
+    :param order_by: Список выражений сортировки
+    :return: SELECT с колонками record_date, name, amount, unit_quantity,
+        product_quantity, unit, category, tags
+    """
+    tags = (
+        select(func.string_agg(Tag.name, ", "))
+        .where(Tag.id == any_(Record.tag_ids))
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Record.record_date,
+            Record.name,
+            Record.amount,
+            Record.unit_quantity,
+            Record.product_quantity,
+            Unit.name.label("unit"),
+            Category.name.label("category"),
+            func.coalesce(tags, "").label("tags"),
+        )
+        .outerjoin(Unit, Record.unit_id == Unit.id)
+        .outerjoin(Category, Record.category_id == Category.id)
+        .where(*filters)
+        .order_by(*order_by)
+    )
+
+
+async def stream_export_rows(
+    session: AsyncSession,
+    filters: list,
+    order_by: list,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """
+    Чтение строк экспорта порциями через серверный курсор.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param filters: Фильтры SQLAlchemy
+    :param order_by: Список выражений сортировки
+    :param chunk_size: Размер порции
+    :return: Асинхронный итератор порций строк
+    """
+    stmt = export_rows_stmt(filters, order_by).execution_options(yield_per=chunk_size)
+    result = await session.stream(stmt)
+    async for chunk in result.mappings().partitions(chunk_size):
+        yield chunk
+
+
+def record_list_stmt(filters: list, order_by: list):
+    """
+    Запрос списка записей одним SELECT без ORM-объектов.
+
+    Категория и единица подтягиваются LEFT JOIN-ами, теги агрегируются
+    в JSON-массив коррелированным подзапросом по первичному ключу tag
+    для id из record.tag_ids (без обращения к record_tag). Отношения
+    user и record_type не загружаются.
+
+    :param filters: Фильтры SQLAlchemy
+    :param order_by: Список выражений сортировки
+    :return: SELECT, строки которого преобразуются record_row_to_dto
+    """
+    tags = (
+        select(
+            func.json_agg(
+                func.json_build_object("id", Tag.id, "name", Tag.name, "color", Tag.color)
+            )
+        )
+        .where(Tag.id == any_(Record.tag_ids))
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Record.id,
+            Record.record_date,
+            Record.name,
+            Record.amount,
+            Record.unit_quantity,
+            Record.product_quantity,
+            Record.created_at,
+            Unit.id.label("unit_id"),
+            Unit.name.label("unit_name"),
+            Unit.default_value.label("unit_default_value"),
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            Category.color.label("category_color"),
+            func.coalesce(tags, literal_column("'[]'::json"), type_=JSON).label("tags"),
+        )
+        .outerjoin(Unit, Record.unit_id == Unit.id)
+        .outerjoin(Category, Record.category_id == Category.id)
+        .where(*filters)
+        .order_by(*order_by)
+    )
+
+
+def record_row_to_dto(row: Row, schema: type[BaseModel]) -> BaseModel:
+    """
+    Преобразование строки record_list_stmt в DTO записи.
+
+    :param row: Строка результата record_list_stmt
+    :param schema: Схема ответа (ExpenseRecordDTO или IncomeRecordDTO)
+    :return: DTO записи
+    """
+    return schema.model_validate(
+        {
+            "id": row.id,
+            "record_date": row.record_date,
+            "name": row.name,
+            "amount": row.amount,
+            "unit_quantity": row.unit_quantity,
+            "product_quantity": row.product_quantity,
+            "unit": (
+                {
+                    "id": row.unit_id,
+                    "name": row.unit_name,
+                    "default_value": row.unit_default_value,
+                }
+                if row.unit_id
+                else None
+            ),
+            "category": (
+                {
+                    "id": row.category_id,
+                    "name": row.category_name,
+                    "color": row.category_color,
+                }
+                if row.category_id
+                else None
+            ),
+            "tags": row.tags,
+        }
+    )
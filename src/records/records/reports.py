@@ -1,161 +1,372 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from io import BytesIO, StringIO
+from io import StringIO
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterator, Mapping, Sequence
+from xml.sax.saxutils import escape
+import asyncio
 import csv
-import pandas as pd
+import os
+import shutil
+import tempfile
+import xlsxwriter
+from fastapi.concurrency import run_in_threadpool
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from src.config import PDF_MAX_ROWS, PDF_WORKERS
 
-async def generate_csv(data: list[dict], record_type_id: int) -> BytesIO:
+
+def csv_headers(record_type_id: int) -> list[str]:
     """
-    Генерация CSV отчета с учетом типа записи (расход/доход)
+    Заголовки CSV отчета с учетом типа записи
     
-    :param data: Список словарей с данными записей
     :param record_type_id: 1 - расходы, 2 - доходы
-    :return: BytesIO буфер с CSV данными
+    :return: Список названий колонок
     """
-    text_buffer = StringIO()
-    
     headers = [
         "date", "name", "amount"
     ]
     if record_type_id == 1:
         headers.extend(["unit", "unit_quantity", "product_quantity"])
     headers.extend(["category", "tags"])
+    return headers
+
+
+def csv_row(record: Mapping, record_type_id: int) -> dict:
+    """
+    Преобразование строки экспорта в строку CSV
     
+    :param record: Строка из export_rows_stmt
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :return: Словарь значений по заголовкам CSV
+    """
+    flat_record = {
+        "date": record["record_date"],
+        "name": record["name"],
+        "amount": record["amount"],
+        "category": record["category"] or "",
+        "tags": record["tags"],
+    }
+    if record_type_id == 1:
+        flat_record.update({
+            "unit": record["unit"] or "",
+            "unit_quantity": str(record["unit_quantity"]),
+            "product_quantity": str(record["product_quantity"])
+        })
+    return flat_record
+
+
+async def generate_csv(
+    chunks: AsyncIterable[Sequence[Mapping]], record_type_id: int
+) -> AsyncIterator[bytes]:
+    """
+    Потоковая генерация CSV отчета с учетом типа записи (расход/доход)
+
+    Каждая порция строк сразу кодируется и отдается дальше, поэтому
+    расход памяти не зависит от количества записей.
     
-    flat_data = []
-    for record in data:
-        flat_record = {
-            "date": record["record_date"],
-            "name": record["name"],
-            "amount": record["amount"],
-            "category": record["category"]["name"],
-            "tags": ", ".join(tag["name"] for tag in record["tags"])
-        }
-        if record_type_id == 1:
-            flat_record.update({
-                "unit": record["unit"]["name"] if record["unit"] else "",
-                "unit_quantity": str(record["unit_quantity"]),
-                "product_quantity": str(record["product_quantity"])
-            })
-        flat_data.append(flat_record)
-        
-    writer = csv.DictWriter(text_buffer, fieldnames=headers, delimiter=';')
+    :param chunks: Асинхронный итератор порций строк экспорта
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :return: Асинхронный итератор байтовых блоков CSV (UTF-8 с BOM)
+    """
+    text_buffer = StringIO()
+    writer = csv.DictWriter(
+        text_buffer, fieldnames=csv_headers(record_type_id), delimiter=';'
+    )
     writer.writeheader()
-    writer.writerows(flat_data)
+    yield text_buffer.getvalue().encode('utf-8-sig')
+
+    async for chunk in chunks:
+        text_buffer.seek(0)
+        text_buffer.truncate()
+        writer.writerows(csv_row(record, record_type_id) for record in chunk)
+        yield text_buffer.getvalue().encode('utf-8')
+
+def excel_headers(record_type_id: int) -> list[str]:
+    """
+    Заголовки Excel отчета с учетом типа записи
     
-    text_buffer.seek(0)
-    bytes_buffer = BytesIO(text_buffer.getvalue().encode('utf-8-sig'))
-    return bytes_buffer
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :return: Список названий колонок
+    """
+    headers = ["Дата", "Название", "Сумма", "Категория", "Теги"]
+    if record_type_id == 1:
+        headers.extend(["Единица", "Кол-во единиц", "Кол-во товара"])
+    return headers
+
 
-async def generate_excel(data: list[dict], record_type_id: int) -> BytesIO:
+def excel_row(record: Mapping, record_type_id: int) -> list:
     """
-    Генерация Excel файла с автоматическим форматированием
+    Преобразование строки экспорта в строку Excel
     
-    :param data: Список словарей с данными записей
-    :param record_type_id: 1 - расходы, 2 - доходы 
-    :return: BytesIO буфер с XLSX данными
+    :param record: Строка из export_rows_stmt
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :return: Список значений в порядке excel_headers
     """
-    buffer = BytesIO()
+    row = [
+        record["record_date"],
+        record["name"],
+        float(record["amount"]),
+        record["category"] or "",
+        record["tags"],
+    ]
+    if record_type_id == 1:
+        row.extend([
+            record["unit"] or "",
+            float(record["unit_quantity"]) if record["unit_quantity"] is not None else None,
+            record["product_quantity"],
+        ])
+    return row
+
+
+async def generate_excel(
+    chunks: AsyncIterable[Sequence[Mapping]],
+    record_type_id: int,
+    output: BinaryIO | None = None,
+) -> BinaryIO:
+    """
+    Генерация Excel файла в режиме постоянной памяти xlsxwriter
+
+    Строки пишутся на диск по мере поступления порций из БД, ширина
+    колонок считается по текущим максимумам, весь набор данных
+    в памяти не хранится. В режиме constant_memory запись строк -
+    файловый ввод-вывод, поэтому каждая порция пишется в пуле потоков.
     
-    excel_data = []
-    for record in data:
-        excel_record = {
-            "Дата": record["record_date"],
-            "Название": record["name"],
-            "Сумма": float(record["amount"]),
-            "Категория": record["category"]["name"],
-            "Теги": ", ".join(tag["name"] for tag in record["tags"])
-        }
-        if record_type_id == 1:
-            excel_record.update({
-                "Единица": record["unit"]["name"] if record["unit"] else "",
-                "Кол-во единиц": float(record["unit_quantity"]),
-                "Кол-во товара": record["product_quantity"]
-            })
-        
-        excel_data.append(excel_record)
-
-    df = pd.DataFrame(excel_data)
+    :param chunks: Асинхронный итератор порций строк экспорта
+    :param record_type_id: 1 - расходы, 2 - доходы 
+    :param output: Файл для записи (по умолчанию временный файл)
+    :return: Файловый объект с XLSX данными, позиция в начале
+    """
+    output = output or tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Records')
+    cell_format = workbook.add_format({'font_name': 'Arial'})
+    date_format = workbook.add_format({'font_name': 'Arial', 'num_format': 'yyyy-mm-dd'})
+
+    headers = excel_headers(record_type_id)
+    widths = [len(header) for header in headers]
+    worksheet.write_row(0, 0, headers, cell_format)
+
+    def write_chunk(chunk: Sequence[Mapping], row_idx: int) -> int:
+        """Запись порции строк, возвращает номер следующей строки листа"""
+        for record in chunk:
+            row = excel_row(record, record_type_id)
+            worksheet.write_datetime(row_idx, 0, row[0], date_format)
+            worksheet.write_row(row_idx, 1, row[1:], cell_format)
+            for idx, value in enumerate(row):
+                if value is not None:
+                    widths[idx] = max(widths[idx], len(str(value)))
+            row_idx += 1
+        return row_idx
+
+    row_idx = 1
+    async for chunk in chunks:
+        # Порции пишутся строго по очереди, одновременно с листом
+        # работает не больше одного потока
+        row_idx = await run_in_threadpool(write_chunk, chunk, row_idx)
+
+    for idx, width in enumerate(widths):
+        worksheet.set_column(idx, idx, width + 2, cell_format)
+    # Упаковка zip-архива блокирующая, выносим ее из event loop
+    await run_in_threadpool(workbook.close)
+
+    output.seek(0)
+    return output
+
+
+def iter_file(file: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Чтение файла блоками для StreamingResponse с закрытием по завершении
     
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Records')
-        worksheet = writer.sheets['Records']
-        
-        cell_format = writer.book.add_format({'font_name': 'Arial'})
-        worksheet.set_column('A:Z', 20, cell_format)
-        
-        for idx, col in enumerate(df.columns):
-            max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
-            worksheet.set_column(idx, idx, max_len)
-
-    buffer.seek(0)
-    return buffer
+    :param file: Файловый объект, позиция в начале
+    :param chunk_size: Размер блока в байтах
+    :return: Итератор байтовых блоков
+    """
+    with file:
+        while block := file.read(chunk_size):
+            yield block
+
+
 # Регистрация кастомного шрифта для поддержки кириллицы в PDF
 pdfmetrics.registerFont(TTFont("DejaVuSerif", "DejaVuSerif.ttf"))
-async def generate_pdf(data: list[dict], record_type_id: int) -> BytesIO:
+
+# Количество строк в одной таблице PDF (примерно одна страница)
+PDF_TABLE_ROWS = 40
+# Длина значения, начиная с которой ячейка переносится по словам
+PDF_WRAP_LENGTH = 10
+
+PDF_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'DejaVuSerif'),
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#BB86FC")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTSIZE', (0,0), (-1,0), 12),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#FFFFFF")),
+    ('GRID', (0,0), (-1,-1), 1, colors.HexColor("#444")),
+])
+
+_pdf_executor: ProcessPoolExecutor | None = None
+
+
+class ExportTooLargeError(ValueError):
+    """Количество строк превышает предел формата экспорта"""
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Пул процессов для рендеринга PDF (создается при первом обращении)"""
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pdf_executor
+
+
+def shutdown_pdf_executor():
+    """Остановка пула процессов PDF при завершении приложения"""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(cancel_futures=True)
+        _pdf_executor = None
+
+
+def pdf_headers(record_type_id: int) -> list[str]:
     """
-    Генерация PDF отчета с табличным представлением данных
+    Заголовки PDF отчета с учетом типа записи
     
-    :param data: Список словарей с данными записей
     :param record_type_id: 1 - расходы, 2 - доходы
-    :return: BytesIO буфер с PDF данными
+    :return: Список названий колонок
     """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-    styles['Normal'].fontName = 'DejaVuSerif'
-    styles['Title'].fontName = 'DejaVuSerif'
-    
-    
     headers = ["Дата", "Название", "Сумма"]
     if record_type_id == 1:
         headers.extend(["Кол-во товара", "Единица", "Кол-во единиц"])
     headers.extend(["Категория", "Теги"])
+    return headers
+
+
+def pdf_row(record: Mapping, record_type_id: int) -> list[str]:
+    """
+    Преобразование строки экспорта в строку PDF таблицы
     
-    pdf_data = [[Paragraph(header, styles['Normal']) for header in headers]]
-    for record in data:
-        row = [
-            Paragraph(str(record["record_date"]), styles['Normal']),
-            Paragraph(record["name"], styles['Normal']),
-            Paragraph(f"{float(record['amount']):.2f}"),
-        ]
-        if record_type_id == 1:
-            row.extend([
-                record['product_quantity'],
-                Paragraph(record["unit"]["name"], styles['Normal']),
-                Paragraph(f"{float(record['unit_quantity'])}"),
-            ])
+    :param record: Строка из export_rows_stmt
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :return: Список строковых значений в порядке pdf_headers
+    """
+    row = [
+        str(record["record_date"]),
+        record["name"],
+        f"{float(record['amount']):.2f}",
+    ]
+    if record_type_id == 1:
         row.extend([
-            Paragraph(record["category"]["name"], styles['Normal']),
-            Paragraph(", ".join(tag["name"] for tag in record["tags"]), styles['Normal']),
+            str(record["product_quantity"] or ""),
+            record["unit"] or "",
+            str(float(record["unit_quantity"])) if record["unit_quantity"] is not None else "",
         ])
-        pdf_data.append(row)
-
-    table = Table(pdf_data)
-    style = TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'DejaVuSerif'),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#BB86FC")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTSIZE', (0,0), (-1,0), 12),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#FFFFFF")),
-        ('GRID', (0,0), (-1,-1), 1, colors.HexColor("#444")),
-    ])
-    
-    table.setStyle(style)
-    elements.append(table)
+    row.extend([record["category"] or "", record["tags"]])
+    return row
+
+
+def render_pdf(rows_path: str, record_type_id: int, path: str):
+    """
+    Синхронный рендеринг PDF, выполняется в процессе пула
+
+    Строки читаются из CSV-файла, записанного родительским процессом,
+    и разбиваются на таблицы по PDF_TABLE_ROWS строк с повторяющимся
+    заголовком, поэтому время построения растет линейно. Стиль абзаца
+    создается один раз на весь документ.
     
+    :param rows_path: Путь к CSV-файлу со строками из pdf_row
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :param path: Путь к файлу результата
+    """
+    doc = SimpleDocTemplate(path, pagesize=letter)
+    style = ParagraphStyle("Cell", parent=getSampleStyleSheet()['Normal'], fontName='DejaVuSerif')
+
+    headers = pdf_headers(record_type_id)
+    col_widths = [doc.width / len(headers)] * len(headers)
+
+    elements = []
+    with open(rows_path, newline="", encoding="utf-8") as rows_file:
+        rows = csv.reader(rows_file)
+        while True:
+            batch = list(islice(rows, PDF_TABLE_ROWS))
+            if not batch and elements:
+                break
+            table_data = [[Paragraph(header, style) for header in headers]]
+            # Paragraph нужен только для переноса длинных значений,
+            # короткие ячейки дешевле отрисовать строкой
+            table_data.extend(
+                [
+                    Paragraph(escape(value), style) if len(value) > PDF_WRAP_LENGTH else value
+                    for value in row
+                ]
+                for row in batch
+            )
+            table = Table(table_data, colWidths=col_widths, repeatRows=1)
+            table.setStyle(PDF_TABLE_STYLE)
+            elements.append(table)
+
     doc.build(elements)
-    buffer.seek(0)
-    return buffer
+
+
+async def generate_pdf(
+    chunks: AsyncIterable[Sequence[Mapping]],
+    record_type_id: int,
+    output: BinaryIO | None = None,
+) -> BinaryIO:
+    """
+    Генерация PDF отчета с табличным представлением данных
+
+    Строки по мере поступления порций дописываются во временный CSV-файл
+    (в пуле потоков), процесс пула читает его сам, поэтому в памяти
+    API-процесса держится только текущая порция. reportlab строит
+    документ целиком в памяти, поэтому количество строк ограничено
+    PDF_MAX_ROWS.
+    
+    :param chunks: Асинхронный итератор порций строк экспорта
+    :param record_type_id: 1 - расходы, 2 - доходы
+    :param output: Файл для записи (по умолчанию временный файл)
+    :return: Файловый объект с PDF данными, позиция в начале
+    :raises ExportTooLargeError: Строк больше PDF_MAX_ROWS
+    """
+    fd, rows_path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        with open(rows_path, "w", newline="", encoding="utf-8") as rows_file:
+            writer = csv.writer(rows_file)
+            count = 0
+            async for chunk in chunks:
+                count += len(chunk)
+                if count > PDF_MAX_ROWS:
+                    raise ExportTooLargeError(
+                        f"PDF export is limited to {PDF_MAX_ROWS} records"
+                    )
+                await run_in_threadpool(
+                    writer.writerows, [pdf_row(record, record_type_id) for record in chunk]
+                )
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            get_pdf_executor(), render_pdf, rows_path, record_type_id, path
+        )
+        result = open(path, "rb")
+    finally:
+        os.unlink(rows_path)
+        os.unlink(path)
+
+    if output is not None:
+        with result:
+            shutil.copyfileobj(result, output)
+        result = output
+    result.seek(0)
+    return result
 
 
 def generate_filename(extension: str) -> str:
@@ -1,26 +1,108 @@
 # router.py
-from typing import Annotated
-from uuid import UUID
+from datetime import date
+from decimal import Decimal
+from typing import Annotated, Literal, Optional
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import UUID as SA_UUID, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.auth_config import fastapi_auth
-from src.database.core.db import get_async_session
-from src.database.crud import select_data
-from src.models import Record, User, Tag
+from src.database.core.db import async_session_maker, get_async_session
+from src.config import PDF_MAX_ROWS
+from src.database.crud import count_data, delete_data, insert_rows, select_data
+from src.models import Category, Record, RecordTag, User, Tag, Unit
 
-from .reports import generate_csv, generate_excel, generate_filename, generate_pdf
+from .jobs import ExportJob, export_jobs
+from .queries import (
+    escape_like,
+    name_search_filter,
+    record_list_stmt,
+    record_row_to_dto,
+    stream_export_rows,
+)
+from .suggestions import name_suggestions
+from .reports import (
+    ExportTooLargeError,
+    generate_csv,
+    generate_excel,
+    generate_filename,
+    generate_pdf,
+    iter_file,
+)
 from src.routers.base import BaseRouter
 from src.schemas import (
+    BulkRecordResultDTO,
     ExpenseRecordDTO,
     ExpenseRecordAddDTO,
+    ExportJobDTO,
     IncomeRecordAddDTO,
     IncomeRecordDTO,
+    NameSuggestionDTO,
+    RecordListParamsDTO,
 )
 
+# Маппинг генераторов файлов: расширение -> (генератор, MIME-тип)
+FILE_GENERATORS = {
+    'csv': (generate_csv, 'text/csv'),
+    'xlsx': (generate_excel, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'pdf': (generate_pdf, 'application/pdf'),
+}
+
+# Максимальное количество записей в одном запросе массового создания
+BULK_MAX_ITEMS = 5000
+
+# Колонки, доступные для сортировки списка записей
+RECORD_SORT_COLUMNS = {
+    "record_date": Record.record_date,
+    "amount": Record.amount,
+    "name": Record.name,
+    "created_at": Record.created_at,
+}
+# Сортировка по умолчанию; ее курсоры не содержат ключа сортировки
+DEFAULT_RECORD_SORT = "-record_date"
+
+
+def record_list_params(
+    date_from: Optional[date] = Query(None, description="Дата записи не раньше"),
+    date_to: Optional[date] = Query(None, description="Дата записи не позже"),
+    category_ids: list[UUID] = Query([], description="Категории записи"),
+    unit_ids: list[UUID] = Query([], description="Единицы измерения записи"),
+    tag_ids: list[UUID] = Query([], description="Теги записи"),
+    tag_mode: Literal["any", "all"] = Query(
+        "any", description="Любой из тегов (any) или все теги (all)"
+    ),
+    amount_min: Optional[Decimal] = Query(None, description="Сумма не меньше"),
+    amount_max: Optional[Decimal] = Query(None, description="Сумма не больше"),
+    name_prefix: Optional[str] = Query(None, description="Начало названия (без учета регистра)"),
+    sort: str = Query(
+        DEFAULT_RECORD_SORT,
+        description="Ключ сортировки: record_date, amount, name, created_at; '-' - по убыванию",
+    ),
+) -> RecordListParamsDTO:
+    """Параметры фильтрации и сортировки списка записей из query-строки"""
+    try:
+        return RecordListParamsDTO(
+            date_from=date_from,
+            date_to=date_to,
+            category_ids=category_ids,
+            unit_ids=unit_ids,
+            tag_ids=tag_ids,
+            tag_mode=tag_mode,
+            amount_min=amount_min,
+            amount_max=amount_max,
+            name_prefix=name_prefix,
+            sort=sort,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
 
 class RecordRouter(BaseRouter):
     def __init__(self, prefix, record_type_id, schema, create_schema):
@@ -49,6 +131,194 @@ class RecordRouter(BaseRouter):
             methods=["GET"],
             response_class=StreamingResponse
             )
+        # Поиск по подстроке названия и подсказки названий при вводе
+        self.router.add_api_route(
+            '/search',
+            self.search,
+            methods=["GET"],
+            response_model=list[schema],
+        )
+        self.router.add_api_route(
+            '/autocomplete',
+            self.autocomplete,
+            methods=["GET"],
+            response_model=list[NameSuggestionDTO],
+        )
+        # Массовое создание записей одной транзакцией
+        self.router.add_api_route(
+            '/bulk',
+            self.bulk_create,
+            methods=["POST"],
+            response_model=BulkRecordResultDTO,
+            status_code=201,
+        )
+        # Фоновый экспорт: постановка задачи, статус и скачивание результата
+        self.router.add_api_route(
+            '/export/jobs',
+            self.create_export_job,
+            methods=["POST"],
+            response_model=ExportJobDTO,
+            status_code=202,
+        )
+        self.router.add_api_route(
+            '/export/jobs/{job_id}',
+            self.get_export_job,
+            methods=["GET"],
+            response_model=ExportJobDTO,
+        )
+        self.router.add_api_route(
+            '/export/jobs/{job_id}/file',
+            self.download_export_job,
+            methods=["GET"],
+            response_class=FileResponse,
+        )
+
+    async def get_all(
+        self,
+        response: Response,
+        params: RecordListParamsDTO = Depends(record_list_params),
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(fastapi_auth.current_user()),
+        limit: int = Query(
+            100, ge=1, le=100, description="Максимальное количество записей"
+        ),
+        skip: int = Query(0, ge=0, description="Смещение от начала выборки"),
+        cursor: Optional[str] = Query(
+            None, description="Курсор следующей страницы (из заголовка X-Next-Cursor)"
+        ),
+        with_total: bool = Query(
+            False, description="Вернуть общее количество в заголовке X-Total-Count"
+        ),
+    ):
+        """
+        Список записей с фильтрами и выбором сортировки.
+
+        Курсор привязан к сортировке, с которой он был выдан.
+
+        :param params: параметры фильтрации и сортировки
+        :param with_total: флаг возврата количества с учетом фильтров
+        """
+        return await self.list_items(
+            response, session, current_user, limit, skip, cursor, params, with_total
+        )
+
+    def get_count_params(self, params: Optional[RecordListParamsDTO] = None) -> Optional[str]:
+        """Фильтры списка без сортировки и значений по умолчанию"""
+        if params is None:
+            return None
+        key = params.model_dump_json(exclude={"sort"}, exclude_defaults=True)
+        return None if key == "{}" else key
+
+    def get_filters(self, current_user: User, params: Optional[RecordListParamsDTO] = None):
+        """
+        Базовые фильтры и фильтры списка записей.
+
+        Каждый параметр превращается в предикат по индексируемым колонкам:
+        диапазоны по record_date и amount, IN по category_id и unit_id,
+        префикс по lower(name) (индекс text_pattern_ops), теги через
+        операторы массива tag_ids (GIN-индекс): && для any, @> для all.
+
+        :param params: параметры фильтрации списка
+        """
+        filters = super().get_filters(current_user)
+        if params is None:
+            return filters
+
+        if params.date_from is not None:
+            filters.append(Record.record_date >= params.date_from)
+        if params.date_to is not None:
+            filters.append(Record.record_date <= params.date_to)
+        if params.category_ids:
+            filters.append(Record.category_id.in_(params.category_ids))
+        if params.unit_ids:
+            filters.append(Record.unit_id.in_(params.unit_ids))
+        if params.amount_min is not None:
+            filters.append(Record.amount >= params.amount_min)
+        if params.amount_max is not None:
+            filters.append(Record.amount <= params.amount_max)
+        if params.name_prefix:
+            prefix = escape_like(params.name_prefix.lower())
+            filters.append(func.lower(Record.name).like(prefix + "%", escape="\\"))
+        if params.tag_ids:
+            tag_ids = list(set(params.tag_ids))
+            if params.tag_mode == "all":
+                filters.append(Record.tag_ids.contains(tag_ids))
+            else:
+                filters.append(Record.tag_ids.overlap(tag_ids))
+        return filters
+
+    def get_sort(self, params: Optional[RecordListParamsDTO] = None):
+        """Сортировка по ключу из параметров списка"""
+        if params is None:
+            return super().get_sort()
+        column = RECORD_SORT_COLUMNS[params.sort.lstrip("-")]
+        sort_key = None if params.sort == DEFAULT_RECORD_SORT else params.sort
+        return sort_key, column, params.sort.startswith("-")
+
+    async def search(
+        self,
+        q: str = Query(..., min_length=1, max_length=70, description="Часть названия"),
+        limit: int = Query(20, ge=1, le=100),
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Поиск записей по подстроке названия без учета регистра
+        (условие и используемые индексы - name_search_filter).
+
+        :param q: искомая часть названия
+        :param limit: максимальное количество записей
+        """
+        filters = [*self.get_filters(current_user), name_search_filter(q)]
+        items = await self.get_items(session, filters, limit=limit)
+        return [self.to_schema(item) for item in items]
+
+    async def autocomplete(
+        self,
+        q: str = Query(..., min_length=1, max_length=70, description="Введенная часть названия"),
+        limit: int = Query(10, ge=1, le=50),
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Подсказки названий с категорией, единицей и суммой последнего использования.
+
+        Отвечает из кэша частых названий пользователя, БД читается только
+        после изменения данных пользователя.
+
+        :param q: введенная часть названия
+        :param limit: максимальное количество подсказок
+        """
+        return await name_suggestions.suggest(
+            session, current_user.id, self.record_type_id, q, limit
+        )
+
+    async def get_items(
+        self,
+        session: AsyncSession,
+        filters: list,
+        limit: int = 100,
+        skip: int = 0,
+        order_by: Optional[list] = None,
+    ):
+        """
+        Чтение записей одним Core-запросом вместо ORM с selectin-загрузкой.
+
+        :param filters: фильтры выборки записей
+        :param limit: максимальное количество записей
+        :param skip: смещение в выборке
+        :param order_by: выражения сортировки (по умолчанию self.order_by)
+        """
+        stmt = (
+            record_list_stmt(filters, order_by or self.order_by)
+            .limit(limit)
+            .offset(skip)
+        )
+        result = await session.execute(stmt)
+        return result.all()
+
+    def to_schema(self, item):
+        return record_row_to_dto(item, self.schema)
 
     async def create_record(
         self, session: AsyncSession, data: BaseModel, current_user: User
@@ -67,46 +337,153 @@ class RecordRouter(BaseRouter):
             session, data, kwargs, ["tags", "unit", "category"], ["tags"]
         )
 
+    async def get_owned_ids(
+        self, session: AsyncSession, model, ids: set[UUID], current_user: User
+    ) -> set[UUID]:
+        """
+        Отбор идентификаторов, принадлежащих пользователю, одним запросом.
+
+        :param model: модель справочника (Category, Unit, Tag)
+        :param ids: проверяемые идентификаторы
+        """
+        if not ids:
+            return set()
+        filters = [model.id.in_(ids), model.user_id == current_user.id]
+        if hasattr(model, "record_type_id"):
+            filters.append(model.record_type_id == self.record_type_id)
+        result = await session.execute(select(model.id).where(*filters))
+        return set(result.scalars().all())
+
+    async def bulk_create(
+        self,
+        data: list[dict] = Body(),
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Массовое создание записей.
+
+        Элементы валидируются по схеме создания, включая ограничения
+        колонок, ссылки на категории, единицы и теги проверяются тремя
+        запросами на весь пакет. Корректные записи и их связи с тегами
+        вставляются многострочными INSERT с одним commit, ошибки
+        возвращаются по индексу элемента.
+
+        :param data: список записей в формате схемы создания
+        :return: идентификаторы созданных записей и ошибки по элементам
+        """
+        if len(data) > BULK_MAX_ITEMS:
+            raise HTTPException(
+                400, detail=f"Too many items, maximum is {BULK_MAX_ITEMS}"
+            )
+
+        errors = []
+        items = []
+        for index, raw in enumerate(data):
+            try:
+                items.append((index, self.create_schema.model_validate(raw)))
+            except ValidationError as e:
+                errors.append({"index": index, "detail": str(e)})
+
+        categories = await self.get_owned_ids(
+            session, Category, {item.category_id for _, item in items} - {None}, current_user
+        )
+        units = await self.get_owned_ids(
+            session, Unit, {getattr(item, "unit_id", None) for _, item in items} - {None}, current_user
+        )
+        tags = await self.get_owned_ids(
+            session, Tag, {tag_id for _, item in items for tag_id in item.tags}, current_user
+        )
+
+        kwargs = self.get_kwargs(current_user)
+        records = []
+        record_tags = []
+        for index, item in items:
+            unit_id = getattr(item, "unit_id", None)
+            if item.category_id is not None and item.category_id not in categories:
+                errors.append({"index": index, "detail": "Category not found"})
+            elif unit_id is not None and unit_id not in units:
+                errors.append({"index": index, "detail": "Unit not found"})
+            elif not tags.issuperset(item.tags):
+                errors.append({"index": index, "detail": "Tag not found"})
+            else:
+                record_id = uuid4()
+                records.append(
+                    {"id": record_id, **item.model_dump(exclude={"tags"}), **kwargs}
+                )
+                record_tags.extend(
+                    {"record_id": record_id, "tag_id": tag_id} for tag_id in set(item.tags)
+                )
+
+        try:
+            await insert_rows(session, Record, records, commit=False)
+            # Связи вставляются многострочными операторами, чтобы триггер
+            # синхронизации tag_ids срабатывал один раз на пакет
+            await insert_rows(session, RecordTag, record_tags, commit=False)
+            await session.commit()
+        except DBAPIError:
+            # Ограничения колонок проверяются схемой по каждому элементу,
+            # сюда попадают только ошибки БД (например, удаленная категория);
+            # текст ошибки драйвера с SQL и параметрами клиенту не отдается
+            await session.rollback()
+            raise HTTPException(400, detail="Records could not be saved")
+
+        if records:
+            await self.on_change(current_user, count_delta=len(records))
+        errors.sort(key=lambda error: error["index"])
+        return BulkRecordResultDTO(
+            created=[record["id"] for record in records], errors=errors
+        )
+
     async def update_base(
         self, session: AsyncSession, current_user: User, data: BaseModel, item_id: UUID
     ):
         """
         Обновление записи с обработкой тегов.
+
+        Поля записи обновляются одним UPDATE, теги синхронизируются
+        множествами: один DELETE лишних связей и один INSERT ... ON CONFLICT
+        DO NOTHING для новых (только теги пользователя того же типа).
+        Итоговый DTO читается одним запросом, число запросов не зависит
+        от количества тегов.
         
         :param item_id: UUID обновляемой записи
         """
         filters = self.get_filters(current_user)
         filters.append(self.model.id == item_id)
-        record = await self.get_base(
-            session, filters, skip=0, limit=1, selectload_list=[self.model.tags]
+        # Обновление базовых полей
+        stmt = (
+            update(self.model)
+            .where(*filters)
+            .values(**data.model_dump(exclude={"tags"}))
+            .returning(self.model.id)
         )
-        if not record:
+        if (await session.execute(stmt)).scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="Record not found")
-        record = record[0]
-        # Обновление базовых полей
-        update_data = data.model_dump(exclude={"tags"})
-        for key, value in update_data.items():
-            setattr(record, key, value)
-        # Логика обновления тегов (синхронизация множеств)
+        # Синхронизация тегов
         if data.tags is not None:
-            current_tags = {tag.id for tag in record.tags}
-            new_tags = set(data.tags)
-            # Удаление отсутствующих тегов
-            for tag_id in current_tags - new_tags:
-                record.tags = [tag for tag in record.tags if tag.id != tag_id]
-            # Добавление новых тегов
-            existing_tag_ids = {tag.id for tag in record.tags}
-            tags_to_add = [
-                tag
-                for tag_id in new_tags - existing_tag_ids
-                if (tag := await session.get(Tag, tag_id))
-            ]
-            record.tags.extend(tags_to_add)
+            tag_ids = set(data.tags)
+            delete_filters = [RecordTag.record_id == item_id]
+            if tag_ids:
+                delete_filters.append(RecordTag.tag_id.not_in(tag_ids))
+            await delete_data(session, RecordTag, delete_filters, commit=False)
+
+            if tag_ids:
+                owned_tags = select(literal(item_id, SA_UUID), Tag.id).where(
+                    Tag.id.in_(tag_ids),
+                    Tag.user_id == current_user.id,
+                    Tag.record_type_id == self.record_type_id,
+                )
+                await session.execute(
+                    pg_insert(RecordTag)
+                    .from_select(["record_id", "tag_id"], owned_tags)
+                    .on_conflict_do_nothing()
+                )
 
         await session.commit()
-        await session.refresh(record)
 
-        return record.to_dto()
+        items = await self.get_items(session, filters, limit=1)
+        return self.to_schema(items[0])
 
     async def create(
         self,
@@ -117,15 +494,45 @@ class RecordRouter(BaseRouter):
         try:
             data = self.create_schema.model_validate(data)
             db_item = await self.create_record(session, data, current_user)
-            return db_item
         except Exception as e:
             await session.rollback()
             raise HTTPException(400, detail=str(e))
+
+        await self.on_change(current_user, count_delta=1)
+        return db_item
         
+    async def stream_rows(self, filters: list):
+        """
+        Порционное чтение строк экспорта в собственной сессии.
+
+        Сессия из зависимости закрывается до отправки тела ответа,
+        поэтому потоковый ответ открывает свою.
+
+        :param filters: фильтры выборки записей
+        """
+        async with async_session_maker() as session:
+            async for chunk in stream_export_rows(session, filters, self.order_by):
+                yield chunk
+
+    async def check_export_size(self, extension: str, filters: list):
+        """
+        Отклонение PDF-экспорта больше PDF_MAX_ROWS записей до начала генерации.
+
+        :param extension: формат файла
+        :param filters: фильтры выборки записей
+        """
+        if extension != 'pdf':
+            return
+        async with async_session_maker() as session:
+            total = await count_data(session, self.model, filters)
+        if total > PDF_MAX_ROWS:
+            raise HTTPException(
+                status_code=400, detail=f"PDF export is limited to {PDF_MAX_ROWS} records"
+            )
+
     async def export_records(
         self,
         extension: Annotated[str, Query()],
-        session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(fastapi_auth.current_user())
     ):
         """
@@ -135,36 +542,122 @@ class RecordRouter(BaseRouter):
         :return: StreamingResponse с файлом
         """
         filters = self.get_filters(current_user)
-        items = await self.get_base(session, filters, no_limit=True)
-        
-        data = [item.to_dto().model_dump() for item in items]
-        # Маппинг генераторов файлов
-        file_generators = {
-            'csv': (generate_csv, 'text/csv', 'data.csv'),
-            'xlsx': (generate_excel, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'data.xlsx'),
-            'pdf': (generate_pdf, 'application/pdf', 'data.pdf')
-        }
-
-        if extension not in file_generators:
+        if extension not in FILE_GENERATORS:
             raise HTTPException(status_code=400, detail="Unsupported file type")
 
-        generator, media_type, filename = file_generators[extension]
-        
-        try:
-            # Генерация файла в памяти
-            buffer = await generator(data, self.record_type_id)
-            filename = generate_filename(extension)
-            # Настройка streaming ответа
+        await self.check_export_size(extension, filters)
+
+        generator, media_type = FILE_GENERATORS[extension]
+        headers = {
+            'Content-Disposition': f'attachment; filename="{generate_filename(extension)}"',
+            'Access-Control-Expose-Headers': 'Content-Disposition'
+        }
+
+        if extension == 'csv':
+            # CSV отдается потоково по мере чтения порций из БД
             return StreamingResponse(
-                buffer,
+                generator(self.stream_rows(filters), self.record_type_id),
                 media_type=media_type,
-                headers={
-                    'Content-Disposition': f'attachment; filename="{filename}"',
-                    'Access-Control-Expose-Headers': 'Content-Disposition'
-                }
+                headers=headers,
             )
+
+        try:
+            # Генерация файла во временный файл из потока строк БД
+            output = await generator(self.stream_rows(filters), self.record_type_id)
+        except ExportTooLargeError as e:
+            # Записи добавились после проверки количества
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        # Настройка streaming ответа
+        return StreamingResponse(iter_file(output), media_type=media_type, headers=headers)
+
+    async def run_export_job(self, job: ExportJob, filters: list):
+        """
+        Генерация файла экспорта для фоновой задачи.
+
+        Сначала считается общее число записей для прогресса, затем строки
+        читаются тем же потоковым запросом, что и у обычного экспорта.
+
+        :param job: задача экспорта
+        :param filters: фильтры выборки записей
+        """
+        generator, _ = FILE_GENERATORS[job.extension]
+        async with async_session_maker() as session:
+            job.total = await session.scalar(
+                select(func.count()).select_from(self.model).where(*filters)
+            )
+
+        async def counted_rows():
+            async for chunk in self.stream_rows(filters):
+                yield chunk
+                job.processed += len(chunk)
+
+        with open(job.path, "wb") as output:
+            if job.extension == 'csv':
+                async for block in generator(counted_rows(), self.record_type_id):
+                    output.write(block)
+            else:
+                await generator(counted_rows(), self.record_type_id, output)
+
+    async def create_export_job(
+        self,
+        extension: Annotated[str, Query()],
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Постановка фоновой задачи экспорта.
+
+        :param extension: формат файла (csv/xlsx/pdf)
+        :return: DTO задачи со статусом pending
+        """
+        if extension not in FILE_GENERATORS:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+
+        filters = self.get_filters(current_user)
+        await self.check_export_size(extension, filters)
+        job = ExportJob(current_user.id, self.record_type_id, extension)
+        export_jobs.submit(job, lambda job: self.run_export_job(job, filters))
+        return job.to_dto()
+
+    async def get_export_job(
+        self,
+        job_id: UUID,
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Статус и прогресс фоновой задачи экспорта.
+
+        :param job_id: UUID задачи
+        :return: DTO задачи
+        """
+        job = export_jobs.get(job_id, current_user.id, self.record_type_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Export job not found")
+        return job.to_dto()
+
+    async def download_export_job(
+        self,
+        job_id: UUID,
+        current_user: User = Depends(fastapi_auth.current_user()),
+    ):
+        """
+        Скачивание результата завершенной задачи экспорта.
+
+        :param job_id: UUID задачи
+        :return: FileResponse с файлом
+        """
+        job = export_jobs.get(job_id, current_user.id, self.record_type_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Export job not found")
+        if job.status != "done":
+            raise HTTPException(status_code=409, detail="Export job is not finished")
+
+        return FileResponse(
+            job.path,
+            media_type=FILE_GENERATORS[job.extension][1],
+            filename=generate_filename(job.extension),
+        )
 
 
 records_router = APIRouter(
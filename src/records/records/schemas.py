@@ -1,18 +1,23 @@
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from pydantic.fields import Field
 
 from src.records.categories.schemas import CategoryDTO
 from src.records.tags.schemas import TagDTO
 from src.records.units.schemas import UnitDTO
 
+# Ограничения колонок record: name VARCHAR(70), product_quantity INTEGER
+RECORD_NAME_LENGTH = 70
+PRODUCT_QUANTITY_MAX = 2**31 - 1
+
 
 class RecordBaseDTO(BaseModel):
     record_date: date = Field(default=date.today())
-    name: str
+    name: str = Field(max_length=RECORD_NAME_LENGTH)
     amount: Decimal = Field(gt=0)
 
     class Config:
@@ -21,7 +26,7 @@ class RecordBaseDTO(BaseModel):
 
 class ExpenseRecordBaseDTO(RecordBaseDTO):
     unit_quantity: Decimal | None = Field(1, gt=0)
-    product_quantity: int | None = Field(1, gt=0)
+    product_quantity: int | None = Field(1, gt=0, le=PRODUCT_QUANTITY_MAX)
 
 
 class IncomeRecordAddDTO(RecordBaseDTO):
@@ -48,3 +53,74 @@ class ExpenseRecordDTO(ExpenseRecordBaseDTO):
     unit: UnitDTO | None
     category: CategoryDTO
     tags: list[TagDTO]
+
+
+class ExportJobDTO(BaseModel):
+    id: UUID
+    extension: str
+    status: Literal["pending", "running", "done", "failed"]
+    processed: int
+    total: int | None
+    progress: float
+    error: str | None
+    created_at: datetime
+    expires_at: datetime | None
+
+
+class BulkRecordErrorDTO(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkRecordResultDTO(BaseModel):
+    created: list[UUID]
+    errors: list[BulkRecordErrorDTO]
+
+
+RecordSortKey = Literal[
+    "record_date",
+    "-record_date",
+    "amount",
+    "-amount",
+    "name",
+    "-name",
+    "created_at",
+    "-created_at",
+]
+
+
+class RecordListParamsDTO(BaseModel):
+    date_from: date | None = None
+    date_to: date | None = None
+    category_ids: list[UUID] = Field(default_factory=list)
+    unit_ids: list[UUID] = Field(default_factory=list)
+    tag_ids: list[UUID] = Field(default_factory=list)
+    tag_mode: Literal["any", "all"] = "any"
+    amount_min: Decimal | None = Field(None, ge=0)
+    amount_max: Decimal | None = Field(None, ge=0)
+    name_prefix: str | None = Field(None, min_length=1, max_length=70)
+    # Ключ сортировки, "-" перед именем колонки - по убыванию
+    sort: RecordSortKey = "-record_date"
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if self.date_from and self.date_to and self.date_to < self.date_from:
+            raise ValueError("date_to must not be earlier than date_from")
+        if (
+            self.amount_min is not None
+            and self.amount_max is not None
+            and self.amount_max < self.amount_min
+        ):
+            raise ValueError("amount_max must not be less than amount_min")
+        return self
+
+
+class NameSuggestionDTO(BaseModel):
+    name: str
+    count: int
+    amount: float
+    unit_quantity: float | None
+    product_quantity: int | None
+    category_id: UUID | None
+    unit_id: UUID | None
+    last_used: date
@@ -0,0 +1,149 @@
+import uuid
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache.memory import MemoryCache
+from src.cache.versions import get_data_version
+from src.config import AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_CACHE_TTL, AUTOCOMPLETE_NAMES
+from src.models import Record
+
+from .queries import name_search_filter
+
+
+def top_names_stmt(user_id: uuid.UUID, record_type_id: int, limit: int, *filters):
+    """
+    Самые частые названия записей пользователя с параметрами последнего
+    использования.
+
+    Названия группируются без учета регистра, для каждого берется
+    последняя по дате запись (category_id, unit_id, amount, количества).
+
+    :param filters: Дополнительные условия на записи (например, по названию)
+    :return: SELECT с колонками name, count, amount, unit_quantity,
+        product_quantity, category_id, unit_id, last_used
+    """
+    product = func.lower(Record.name)
+    ranked = (
+        select(
+            Record.name,
+            Record.amount,
+            Record.unit_quantity,
+            Record.product_quantity,
+            Record.category_id,
+            Record.unit_id,
+            Record.record_date.label("last_used"),
+            func.count().over(partition_by=product).label("count"),
+            func.row_number()
+            .over(
+                partition_by=product,
+                order_by=(Record.record_date.desc(), Record.created_at.desc()),
+            )
+            .label("position"),
+        )
+        .where(
+            Record.user_id == user_id, Record.record_type_id == record_type_id, *filters
+        )
+        .subquery()
+    )
+    return (
+        select(
+            ranked.c.name,
+            ranked.c.count,
+            ranked.c.amount,
+            ranked.c.unit_quantity,
+            ranked.c.product_quantity,
+            ranked.c.category_id,
+            ranked.c.unit_id,
+            ranked.c.last_used,
+        )
+        .where(ranked.c.position == 1)
+        .order_by(ranked.c.count.desc(), ranked.c.last_used.desc())
+        .limit(limit)
+    )
+
+
+class NameSuggestions:
+    """
+    Кэш частых названий записей для автодополнения.
+
+    Для каждого пользователя и типа записи хранится список из
+    AUTOCOMPLETE_NAMES самых частых названий вместе с версией данных
+    пользователя, на которой он построен. Пока версия не изменилась,
+    подсказки на каждое нажатие клавиши фильтруются в памяти без
+    обращения к БД. Если в списке не хватает подходящих названий, а сам
+    он неполный, оставшиеся ищутся в БД по индексам названия.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, names_limit: int):
+        self._cache = MemoryCache(maxsize, ttl)
+        self.names_limit = names_limit
+
+    async def get_names(
+        self, session: AsyncSession, user_id: uuid.UUID, record_type_id: int
+    ) -> list[dict[str, Any]]:
+        """Список частых названий из кэша или из БД при смене версии данных"""
+        version = await get_data_version(user_id)
+        key = (user_id, record_type_id)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        result = await session.execute(
+            top_names_stmt(user_id, record_type_id, self.names_limit)
+        )
+        names = [dict(row) for row in result.mappings()]
+        self._cache.set(key, (version, names))
+        return names
+
+    async def suggest(
+        self,
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        record_type_id: int,
+        query: str,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """
+        Подсказки названий по введенной строке.
+
+        Сначала идут названия, начинающиеся со строки, затем содержащие
+        ее; внутри каждой группы порядок по частоте использования.
+        Названия вне кэшированного списка добавляются после найденных в
+        нем запросом с name_search_filter.
+
+        :param query: Введенная строка
+        :param limit: Максимальное количество подсказок
+        :return: Список словарей с полями NameSuggestionDTO
+        """
+        query = query.strip().lower()
+        names = await self.get_names(session, user_id, record_type_id)
+        starts, contains = [], []
+        for item in names:
+            position = item["name"].lower().find(query)
+            if position == 0:
+                starts.append(item)
+            elif position > 0:
+                contains.append(item)
+            if len(starts) >= limit:
+                break
+        suggestions = (starts + contains)[:limit]
+        if len(suggestions) >= limit or len(names) < self.names_limit:
+            return suggestions
+
+        # Список ограничен names_limit названиями: более редкие ищутся в БД.
+        # Среди limit самых частых подходящих не больше len(suggestions)
+        # уже найденных, поэтому оставшихся мест хватает
+        seen = {item["name"].lower() for item in suggestions}
+        result = await session.execute(
+            top_names_stmt(user_id, record_type_id, limit, name_search_filter(query))
+        )
+        rest = [dict(row) for row in result.mappings() if row["name"].lower() not in seen]
+        rest.sort(key=lambda item: not item["name"].lower().startswith(query))
+        return (suggestions + rest)[:limit]
+
+
+name_suggestions = NameSuggestions(
+    AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_CACHE_TTL, AUTOCOMPLETE_NAMES
+)
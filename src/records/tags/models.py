@@ -39,6 +39,7 @@ class Tag(Base):
     __table_args__ = (
         Index("idx_name_user", "name", "user_id", "record_type_id", unique=True),
         Index("idx_color_user", "color", "user_id"),
+        Index("idx_tag_user_type", "user_id", "record_type_id"),
     )
 
     def to_dto(self):
@@ -55,4 +56,7 @@ class RecordTag(Base):
     )
     created_at: Mapped[mt.CREATED_AT]
 
-    __table_args__ = (Index("uq_record_tag", "record_id", "tag_id", unique=True),)
+    __table_args__ = (
+        Index("uq_record_tag", "record_id", "tag_id", unique=True),
+        Index("idx_record_tag_tag", "tag_id", "record_id"),
+    )
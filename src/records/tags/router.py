@@ -18,6 +18,7 @@ expense_router = BaseRouter(
     prefix="/expense_tags",
     tags=["tags"],
     record_type_id=1,
+    cache=True,
 ).router
 
 income_router = BaseRouter(
@@ -28,6 +29,7 @@ income_router = BaseRouter(
     prefix="/income_tags",
     tags=["tags"],
     record_type_id=2,
+    cache=True,
 ).router
 
 tags_router.include_router(expense_router)
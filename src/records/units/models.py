@@ -33,6 +33,7 @@ class Unit(Base):
     __table_args__ = (
         Index("idx_unit_name_user", "name", "user_id", unique=True),
         Index("idx_unit_default_value_user", "default_value", "user_id"),
+        Index("idx_unit_user", "user_id"),
     )
 
     def to_dto(self):
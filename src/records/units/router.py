@@ -13,6 +13,7 @@ class UnitRouter(BaseRouter):
             update_schema=UnitAddDTO,
             prefix="/units",
             tags=["units"],
+            cache=True,
         )
 
 
@@ -4,10 +4,15 @@ from uuid import UUID
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Path, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, create_model
+from sqlalchemy import tuple_
 from src.database.core.db import Base, get_async_session
 from src.models import User
 from src.auth.auth_config import fastapi_auth
-from src.database.crud import delete_data, select_data, update_data, upload_data
+from src.cache.backends import cache_backend, rebuild_key
+from src.cache.versions import bump_data_version, get_data_version
+from src.config import COUNT_CACHE_TTL
+from src.database.crud import count_data, delete_data, select_data, update_data, upload_data
+from src.routers.pagination import decode_cursor, encode_cursor
 # Объявление дженерик-типов для гибкой работы с разными моделями и схемами
 ModelType = TypeVar("ModelType", bound=Base)
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
@@ -32,7 +37,8 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         custom_dependencies: Dict[str, List[Depends]] = None,
         custom_responses: Dict[str, Dict[int, Dict[str, Any]]] = None,
         description: str = "",
-        order_by = None
+        order_by = None,
+        cache: bool = False,
     ):
         """
         Базовый роутер для CRUD операций.
@@ -51,6 +57,8 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         :param custom_dependencies: Кастомные зависимости для маршрутов
         :param custom_responses: Кастомные HTTP ответы
         :param description: Описание для документации
+        :param order_by: Колонка сортировки (по умолчанию created_at, по убыванию)
+        :param cache: Флаг кэширования списков пользователя (для справочников)
         """
         self.router = APIRouter(prefix=prefix, tags=tags or [])
         self.model = model
@@ -59,8 +67,12 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
 
         self.create_schema = create_schema
         self.update_schema = update_schema
+        self.cache = cache
         
-        self.order_by = order_by.desc() if order_by else self.model.created_at.desc()
+        # id добавляется вторым ключом, чтобы порядок был стабильным при
+        # совпадающих значениях колонки сортировки (нужно для курсоров)
+        self.order_column = order_by if order_by is not None else self.model.created_at
+        self.order_by = [self.order_column.desc(), self.model.id.desc()]
 
         self.dependencies = self._setup_dependencies(custom_dependencies)
         self.responses = self._setup_responses(custom_responses)
@@ -182,8 +194,12 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
                 description=f"Удалить запись {model_name} по ID",
             )
 
-    def get_filters(self, current_user: User) -> List:
-        """Формирование базовых фильтров для запросов"""
+    def get_filters(self, current_user: User, params: Optional[BaseModel] = None) -> List:
+        """
+        Формирование базовых фильтров для запросов.
+
+        :param params: Параметры фильтрации списка (используются наследниками)
+        """
         filters = []
         # Фильтр по типу записи (для разделения расходов/доходов)
         if self.record_type_id is not None:
@@ -206,6 +222,167 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
 
         return kwargs
 
+    def get_sort(self, params: Optional[BaseModel] = None) -> tuple[Optional[str], Any, bool]:
+        """
+        Сортировка списка.
+
+        :param params: Параметры списка (используются наследниками)
+        :return: Кортеж (ключ сортировки для курсора, колонка, флаг убывания)
+        """
+        return None, self.order_column, True
+
+    def get_order_by(self, column, descending: bool) -> List:
+        """Выражения ORDER BY с id вторым ключом"""
+        if descending:
+            return [column.desc(), self.model.id.desc()]
+        return [column.asc(), self.model.id.asc()]
+
+    def get_cursor_filter(
+        self,
+        cursor: str,
+        column=None,
+        descending: bool = True,
+        sort_key: Optional[str] = None,
+    ):
+        """Фильтр keyset-пагинации: элементы строго после курсора"""
+        column = self.order_column if column is None else column
+        value, item_id = decode_cursor(cursor, column.type.python_type, sort_key)
+        if descending:
+            return tuple_(column, self.model.id) < tuple_(value, item_id)
+        return tuple_(column, self.model.id) > tuple_(value, item_id)
+
+    def get_next_cursor(self, item, column=None, sort_key: Optional[str] = None) -> str:
+        """Курсор следующей страницы по последнему элементу текущей"""
+        column = self.order_column if column is None else column
+        return encode_cursor(getattr(item, column.key), item.id, sort_key)
+
+    def get_cache_namespace(self, current_user: User) -> str:
+        """Префикс ключей кэша: модель, пользователь и тип записи"""
+        return f"ref:{self.model.__tablename__}:{current_user.id}:{self.record_type_id}"
+
+    def get_count_key(self, current_user: User) -> str:
+        """Ключ счетчика элементов пользователя по модели и типу записи"""
+        return f"count:{self.model.__tablename__}:{current_user.id}:{self.record_type_id}"
+
+    def get_count_params(self, params: Optional[BaseModel] = None) -> Optional[str]:
+        """
+        Ключ фильтров списка для кэша количества.
+
+        :param params: Параметры списка (используются наследниками)
+        :return: Строка-ключ или None, если список не отфильтрован
+        """
+        return None
+
+    async def on_change(self, current_user: User, count_delta: int = 0):
+        """
+        Обработчик успешного изменения данных пользователя.
+
+        Увеличивает версию данных пользователя (кэш статистики) и версию
+        кэша списков, после чего старые ключи больше не читаются
+        и вытесняются по LRU/TTL.
+
+        :param count_delta: Изменение количества элементов (создание/удаление)
+        """
+        if count_delta:
+            await cache_backend.adjust(self.get_count_key(current_user), count_delta)
+        await bump_data_version(current_user.id)
+        if self.cache:
+            await cache_backend.incr(f"{self.get_cache_namespace(current_user)}:version")
+
+    async def count_items(
+        self,
+        session: AsyncSession,
+        current_user: User,
+        params: Optional[BaseModel] = None,
+    ) -> int:
+        """
+        Общее количество элементов списка без учета пагинации.
+
+        Для списка без фильтров используется счетчик пользователя, который
+        корректируется в on_change при создании и удалении элементов, а при
+        отсутствии в кэше заполняется точным COUNT(*). Количество для списка
+        с фильтрами кэшируется с версией данных пользователя в ключе и
+        пересчитывается только после ее изменения.
+
+        Результат COUNT(*) сохраняется, только если за время подсчета не
+        изменились ни версия данных, ни поколение пересчетов счетчика
+        (его увеличивает adjust, не нашедший ключа). Иначе изменение могло
+        не попасть в подсчет, и количество возвращается без кэширования.
+
+        :param params: Параметры фильтрации списка
+        :return: Количество элементов
+        """
+        key = self.get_count_key(current_user)
+        params_key = self.get_count_params(params)
+        version = await get_data_version(current_user.id)
+        if params_key is not None:
+            key = f"{key}:{version}:{params_key}"
+
+        count = await cache_backend.get(key)
+        if count is not None:
+            return count
+
+        # Поколение есть только у корректируемого счетчика списка без фильтров
+        generation_key = rebuild_key(key) if params_key is None else None
+        generation = (
+            await cache_backend.get_version(generation_key) if generation_key else None
+        )
+        count = await count_data(
+            session, self.model, self.get_filters(current_user, params)
+        )
+
+        async def unchanged() -> bool:
+            if await get_data_version(current_user.id) != version:
+                return False
+            return generation_key is None or (
+                await cache_backend.get_version(generation_key) == generation
+            )
+
+        if await unchanged():
+            await cache_backend.set(key, count, COUNT_CACHE_TTL)
+            # Изменение между проверкой и записью отменяет сохранение
+            if not await unchanged():
+                await cache_backend.delete(key)
+        return count
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        current_user: User,
+        limit: int,
+        skip: int,
+        cursor: Optional[str],
+        params: Optional[BaseModel] = None,
+    ) -> tuple[List[SchemaType], Optional[str]]:
+        """
+        Получение страницы DTO и курсора следующей страницы.
+
+        :param limit: Лимит записей
+        :param skip: Смещение (игнорируется при наличии cursor)
+        :param cursor: Курсор keyset-пагинации
+        :param params: Параметры фильтрации и сортировки списка
+        :return: Кортеж (список DTO, курсор следующей страницы или None)
+        """
+        filters = self.get_filters(current_user, params)
+        sort_key, column, descending = self.get_sort(params)
+        if cursor is not None:
+            filters.append(self.get_cursor_filter(cursor, column, descending, sort_key))
+            skip = 0
+
+        items = await self.get_items(
+            session,
+            filters,
+            limit=limit,
+            skip=skip,
+            order_by=self.get_order_by(column, descending),
+        )
+        next_cursor = (
+            self.get_next_cursor(items[-1], column, sort_key)
+            if len(items) == limit
+            else None
+        )
+        return [self.to_schema(item) for item in items], next_cursor
+
     async def get_base(
         self,
         session: AsyncSession,
@@ -213,7 +390,8 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         limit: int = 100,
         skip: int = 0,
         selectload_list: List = [],
-        no_limit: bool = False
+        no_limit: bool = False,
+        order_by: Optional[List] = None,
     ) -> List[ModelType]:
         """
         Базовый метод для получения записей из БД с фильтрацией и пагинацией.
@@ -224,6 +402,7 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         :param skip: Смещение в выборке (для пагинации)
         :param selectload_list: Список отношений для eager loading
         :param no_limit: Флаг отключения лимита выборки
+        :param order_by: Выражения сортировки (по умолчанию self.order_by)
         :return: Список объектов модели
         """
         return await select_data(
@@ -234,9 +413,37 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
             skip=skip,
             selectload=selectload_list,
             no_limit=no_limit,
-            order_by=self.order_by
+            order_by=order_by or self.order_by
+        )
+
+    async def get_items(
+        self,
+        session: AsyncSession,
+        filters: List,
+        limit: int = 100,
+        skip: int = 0,
+        order_by: Optional[List] = None,
+    ) -> List[Any]:
+        """
+        Получение элементов для эндпоинтов чтения (get_all, get_one).
+
+        Наследники могут переопределить метод, чтобы читать данные без
+        ORM-объектов; результат преобразуется в DTO через to_schema.
+        
+        :param filters: Список фильтров SQLAlchemy
+        :param limit: Максимальное количество записей
+        :param skip: Смещение в выборке
+        :param order_by: Выражения сортировки (по умолчанию self.order_by)
+        :return: Список элементов
+        """
+        return await self.get_base(
+            session, filters, limit=limit, skip=skip, order_by=order_by
         )
 
+    def to_schema(self, item) -> SchemaType:
+        """Преобразование элемента из get_items в DTO ответа"""
+        return item.to_dto()
+
     async def create_base(
         self,
         session: AsyncSession,
@@ -295,24 +502,88 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
 
     async def get_all(
         self,
+        response: Response,
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(fastapi_auth.current_user()),
         limit: int = Query(
             100, ge=1, le=100, description="Максимальное количество записей"
         ),
         skip: int = Query(0, ge=0, description="Смещение от начала выборки"),
+        cursor: Optional[str] = Query(
+            None, description="Курсор следующей страницы (из заголовка X-Next-Cursor)"
+        ),
+        with_total: bool = Query(
+            False, description="Вернуть общее количество в заголовке X-Total-Count"
+        ),
     ) -> List[SchemaType]:
         """
         Обработчик GET-запроса для получения списка записей.
+
+        Поддерживает два режима пагинации: устаревший через skip (OFFSET)
+        и keyset через cursor, стоимость которого не зависит от глубины
+        страницы. Курсор следующей страницы возвращается в заголовке
+        X-Next-Cursor, если страница заполнена полностью.
         
         :param limit: Лимит записей (1-100)
-        :param skip: Смещение для пагинации
+        :param skip: Смещение для пагинации (игнорируется при наличии cursor)
+        :param cursor: Курсор keyset-пагинации
+        :param with_total: Флаг возврата общего количества элементов
         :return: Список DTO объектов
         """
-        filters = self.get_filters(current_user)
+        return await self.list_items(
+            response, session, current_user, limit, skip, cursor, with_total=with_total
+        )
 
-        items = await self.get_base(session, filters=filters, limit=limit, skip=skip)
-        return [item.to_dto() for item in items]
+    async def list_items(
+        self,
+        response: Response,
+        session: AsyncSession,
+        current_user: User,
+        limit: int,
+        skip: int,
+        cursor: Optional[str],
+        params: Optional[BaseModel] = None,
+        with_total: bool = False,
+    ) -> List[SchemaType]:
+        """
+        Общая реализация списка для get_all и его переопределений.
+
+        :param params: Параметры фильтрации и сортировки списка
+        :param with_total: Флаг возврата количества в заголовке X-Total-Count
+        :return: Список DTO объектов
+        """
+        if not self.cache:
+            items, next_cursor = await self.get_page(
+                session, current_user, limit, skip, cursor, params
+            )
+        else:
+            # Справочники отдаются из кэша без обращения к БД
+            namespace = self.get_cache_namespace(current_user)
+            version = await cache_backend.get_version(f"{namespace}:version")
+            params_key = params.model_dump_json() if params is not None else None
+            key = f"{namespace}:{version}:{limit}:{skip}:{cursor}:{params_key}"
+            cached = await cache_backend.get(key)
+            if cached is not None:
+                items = [self.schema.model_validate(item) for item in cached["items"]]
+                next_cursor = cached["next_cursor"]
+            else:
+                items, next_cursor = await self.get_page(
+                    session, current_user, limit, skip, cursor, params
+                )
+                await cache_backend.set(
+                    key,
+                    {
+                        "items": [item.model_dump(mode="json") for item in items],
+                        "next_cursor": next_cursor,
+                    },
+                )
+
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if with_total:
+            total = await self.count_items(session, current_user, params)
+            response.headers["X-Total-Count"] = str(total)
+        return items
 
     async def get_one(
         self,
@@ -329,11 +600,11 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         filters = self.get_filters(current_user)
         filters.append(self.model.id == item_id)
 
-        items = await self.get_base(session, filters, limit=1)
+        items = await self.get_items(session, filters, limit=1)
         if not items:
             raise HTTPException(404, detail="Item not found")
 
-        return items[0].to_dto()
+        return self.to_schema(items[0])
 
     async def create(
         self,
@@ -352,11 +623,13 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
             db_item = await self.create_base(
                 session, data, self.get_kwargs(current_user)
             )
-            return db_item.to_dto()
         except Exception as e:
             await session.rollback()
             raise HTTPException(400, detail=str(e))
 
+        await self.on_change(current_user, count_delta=1)
+        return db_item.to_dto()
+
     async def update(
         self,
         item_id: UUID,
@@ -376,6 +649,7 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         if not updated_item:
             raise HTTPException(404, detail="Item not found")
 
+        await self.on_change(current_user)
         return updated_item
 
     async def delete(
@@ -392,3 +666,5 @@ class BaseRouter(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaTy
         """
         if not await self.delete_base(session, current_user, item_id):
             raise HTTPException(404, detail="Item not found")
+
+        await self.on_change(current_user, count_delta=-1)
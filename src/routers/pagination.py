@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+
+
+@lru_cache
+def value_adapter(value_type: type) -> TypeAdapter:
+    """Валидатор значения колонки сортировки"""
+    return TypeAdapter(value_type)
+
+
+def encode_cursor(value: Any, item_id: UUID, sort_key: str | None = None) -> str:
+    """
+    Кодирование курсора keyset-пагинации в непрозрачную строку.
+
+    :param value: Значение колонки сортировки последнего элемента страницы
+    :param item_id: UUID последнего элемента страницы
+    :param sort_key: Ключ сортировки, для которой выдан курсор
+    :return: base64-строка курсора
+    """
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = [value, str(item_id)]
+    if sort_key is not None:
+        payload.append(sort_key)
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, value_type: type, sort_key: str | None = None
+) -> tuple[Any, UUID]:
+    """
+    Декодирование курсора keyset-пагинации.
+
+    :param cursor: Строка курсора, полученная от клиента
+    :param value_type: Python-тип колонки сортировки
+    :param sort_key: Ожидаемый ключ сортировки (курсор другой сортировки отклоняется)
+    :return: Кортеж (значение колонки сортировки, UUID элемента)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, item_id, *rest = json.loads(base64.urlsafe_b64decode(padded))
+        if (rest[0] if rest else None) != sort_key:
+            raise ValueError("sort key mismatch")
+        # Значение приводится к типу колонки сортировки: подделанный курсор
+        # не должен доходить до запроса (ошибка драйвера дала бы 500)
+        if value is not None:
+            value = value_adapter(value_type).validate_python(value)
+        return value, UUID(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, detail="Invalid cursor")
@@ -1,12 +1,43 @@
 from src.auth.schemas import UserCreate, UserRead, UserUpdate
 from src.records.categories.schemas import CategoryAddDTO, CategoryDTO
 from src.records.records.schemas import (
+    BulkRecordErrorDTO,
+    BulkRecordResultDTO,
     ExpenseRecordAddDTO,
     ExpenseRecordBaseDTO,
     ExpenseRecordDTO,
+    ExportJobDTO,
     IncomeRecordAddDTO,
     IncomeRecordDTO,
+    NameSuggestionDTO,
+    RecordListParamsDTO,
 )
 from src.records.tags.schemas import TagAddDTO, TagDTO
 from src.records.units.schemas import UnitAddDTO, UnitDTO
-from src.stats.schemas import CategoryMonthStatsDTO, TrendBodyDTO, TrendDTO
+from src.stats.schemas import (
+    CashflowDTO,
+    CashflowPointDTO,
+    CategoryComparisonDTO,
+    CategoryMonthStatsDTO,
+    CategoryPercentilesDTO,
+    CategoryRunningTotalDTO,
+    DashboardBodyDTO,
+    DashboardMonthStatDTO,
+    DashboardResultDTO,
+    DashboardTrendSeriesStatDTO,
+    DashboardTrendStatDTO,
+    DateRangeBodyDTO,
+    HeatmapCellDTO,
+    HistogramBinDTO,
+    HistogramBodyDTO,
+    PriceHistoryBodyDTO,
+    PricePointDTO,
+    StatsFilterBodyDTO,
+    TopProductDTO,
+    TopProductsBodyDTO,
+    TrendBodyDTO,
+    TrendDTO,
+    TrendSeriesBodyDTO,
+    TrendSeriesDTO,
+    TrendSeriesItemDTO,
+)
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import uuid
+from typing import Any, Awaitable, Callable
+
+from src.cache.backends import cache_backend
+from src.cache.versions import get_data_version
+from src.config import STATS_CACHE_TTL
+
+
+async def cached_stats(
+    user_id: uuid.UUID,
+    record_type_name: str,
+    endpoint: str,
+    params: dict[str, Any],
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Получение результата статистики из кэша или его вычисление.
+
+    Ключ включает версию данных пользователя, поэтому после изменения
+    записей устаревший результат прочитан не будет.
+
+    :param user_id: UUID пользователя
+    :param record_type_name: Тип записи (income/expense)
+    :param endpoint: Имя статистики
+    :param params: Параметры запроса (должны сериализоваться в JSON)
+    :param compute: Корутина вычисления, возвращающая JSON-совместимое значение
+    :return: Результат статистики
+    """
+    version = await get_data_version(user_id)
+    params_hash = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    key = f"stats:{user_id}:{record_type_name}:{endpoint}:{version}:{params_hash}"
+
+    result = await cache_backend.get(key)
+    if result is None:
+        result = await compute()
+        await cache_backend.set(key, result, STATS_CACHE_TTL)
+    return result
@@ -0,0 +1,253 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import BalanceCheckpoint, Category, DailyRecordTotal, RecordType, User
+from src.stats.database import SERIES_EMPTY_NAMES
+
+# Ключ накопленного итога: (record_type_id, category_id)
+TotalKey = tuple[int, UUID | None]
+
+
+def daily_amount():
+    """Сумма дневного итога: amount для доходов, amount * product_quantity для расходов"""
+    return case(
+        (RecordType.name == "income", DailyRecordTotal.amount_sum),
+        else_=DailyRecordTotal.amount_qty_sum,
+    )
+
+
+async def load_checkpoint(
+    session: AsyncSession, current_user_uuid: UUID, month: date
+) -> dict[TotalKey, Decimal]:
+    """Накопленные итоги из контрольной точки месяца"""
+    result = await session.execute(
+        select(
+            BalanceCheckpoint.record_type_id,
+            BalanceCheckpoint.category_id,
+            BalanceCheckpoint.cumulative_sum,
+        ).where(
+            BalanceCheckpoint.user_id == current_user_uuid,
+            BalanceCheckpoint.month == month,
+        )
+    )
+    return {(type_id, category_id): value for type_id, category_id, value in result}
+
+
+async def latest_checkpoint_month(
+    session: AsyncSession, current_user_uuid: UUID
+) -> date | None:
+    return await session.scalar(
+        select(func.max(BalanceCheckpoint.month)).where(
+            BalanceCheckpoint.user_id == current_user_uuid
+        )
+    )
+
+
+async def ensure_checkpoints(
+    session: AsyncSession, current_user_uuid: UUID, target: date
+) -> dict[TotalKey, Decimal]:
+    """
+    Накопленные итоги на конец месяца target.
+
+    Недостающие контрольные точки после последней сохраненной строятся
+    по дневным итогам одним GROUP BY по месяцам и сохраняются. На время
+    построения строка пользователя блокируется FOR NO KEY UPDATE, что
+    исключает гонку с триггером инвалидации.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param current_user_uuid: UUID пользователя
+    :param target: Первое число месяца
+    :return: Словарь {(record_type_id, category_id): накопленная сумма}
+    """
+    latest = await latest_checkpoint_month(session, current_user_uuid)
+    if latest is not None and latest >= target:
+        return await load_checkpoint(session, current_user_uuid, target)
+
+    await session.execute(
+        select(User.id)
+        .where(User.id == current_user_uuid)
+        .with_for_update(key_share=True)
+    )
+    latest = await latest_checkpoint_month(session, current_user_uuid)
+    if latest is not None and latest >= target:
+        totals = await load_checkpoint(session, current_user_uuid, target)
+        await session.commit()
+        return totals
+
+    if latest is None:
+        first_date = await session.scalar(
+            select(func.min(DailyRecordTotal.record_date)).where(
+                DailyRecordTotal.user_id == current_user_uuid
+            )
+        )
+        if first_date is None:
+            await session.commit()
+            return {}
+        begin = first_date.replace(day=1)
+        totals = {}
+    else:
+        begin = latest + relativedelta(months=1)
+        totals = await load_checkpoint(session, current_user_uuid, latest)
+
+    bucket = cast(func.date_trunc("month", DailyRecordTotal.record_date), Date)
+    result = await session.execute(
+        select(
+            bucket,
+            DailyRecordTotal.record_type_id,
+            DailyRecordTotal.category_id,
+            func.sum(daily_amount()),
+        )
+        .join(RecordType, DailyRecordTotal.record_type_id == RecordType.id)
+        .where(
+            DailyRecordTotal.user_id == current_user_uuid,
+            DailyRecordTotal.record_date >= begin,
+            DailyRecordTotal.record_date < target + relativedelta(months=1),
+        )
+        .group_by(bucket, DailyRecordTotal.record_type_id, DailyRecordTotal.category_id)
+    )
+    monthly = defaultdict(dict)
+    for month, type_id, category_id, amount in result:
+        monthly[month][(type_id, category_id)] = amount or 0
+
+    values = []
+    month = begin
+    while month <= target:
+        for key, amount in monthly[month].items():
+            totals[key] = totals.get(key, 0) + amount
+        values.extend(
+            {
+                "user_id": current_user_uuid,
+                "month": month,
+                "record_type_id": type_id,
+                "category_id": category_id,
+                "cumulative_sum": value,
+            }
+            for (type_id, category_id), value in totals.items()
+        )
+        month += relativedelta(months=1)
+
+    if values:
+        await session.execute(pg_insert(BalanceCheckpoint).on_conflict_do_nothing(), values)
+    await session.commit()
+    return totals
+
+
+async def cashflow(session: AsyncSession, current_user_uuid: UUID, filters) -> dict:
+    """
+    Накопленный баланс (доходы минус расходы) и накопленные итоги по
+    категориям за период.
+
+    Итоги на начало месяца start_date берутся из контрольной точки,
+    оконная сумма считается только по дневным итогам от начала этого
+    месяца до end_date, поэтому время ответа зависит от длины периода,
+    а не от возраста аккаунта.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param current_user_uuid: UUID пользователя
+    :param filters: DateRangeBodyDTO
+    :return: Словарь с ключами opening_balance, points, categories
+        (поля CashflowDTO; суммы в Decimal, к float их приводит схема)
+    """
+    start_month = filters.start_date.replace(day=1)
+    totals = await ensure_checkpoints(
+        session, current_user_uuid, start_month - relativedelta(months=1)
+    )
+    base = dict(totals)
+
+    type_names = dict((await session.execute(select(RecordType.id, RecordType.name))).all())
+    signs = {
+        type_id: 1 if name == "income" else -1 for type_id, name in type_names.items()
+    }
+
+    amount = daily_amount()
+    running = func.sum(amount).over(
+        partition_by=(DailyRecordTotal.record_type_id, DailyRecordTotal.category_id),
+        order_by=DailyRecordTotal.record_date,
+    )
+    result = await session.execute(
+        select(
+            DailyRecordTotal.record_date,
+            DailyRecordTotal.record_type_id,
+            DailyRecordTotal.category_id,
+            amount.label("amount"),
+            running.label("running"),
+        )
+        .join(RecordType, DailyRecordTotal.record_type_id == RecordType.id)
+        .where(
+            DailyRecordTotal.user_id == current_user_uuid,
+            DailyRecordTotal.record_date >= start_month,
+            DailyRecordTotal.record_date <= filters.end_date,
+        )
+        .order_by(DailyRecordTotal.record_date)
+    )
+
+    points: list[dict] = []
+    snapshots: list[dict[TotalKey, Decimal]] = []
+    opening = None
+    for record_date, type_id, category_id, day_amount, day_running in result:
+        if record_date >= filters.start_date and opening is None:
+            opening = dict(totals)
+        key = (type_id, category_id)
+        totals[key] = base.get(key, 0) + (day_running or 0)
+        if record_date < filters.start_date:
+            continue
+
+        if not points or points[-1]["date"] != record_date:
+            points.append({"date": record_date, "income": Decimal(0), "expense": Decimal(0)})
+            snapshots.append({})
+        points[-1]["income" if signs[type_id] > 0 else "expense"] += day_amount or 0
+        snapshots[-1][key] = totals[key]
+
+    if opening is None:
+        opening = dict(totals)
+    opening_balance = sum(signs[key[0]] * value for key, value in opening.items())
+
+    # Баланс и значения категорий в каждой точке с переносом последних значений
+    keys = sorted(totals, key=lambda key: (key[0], str(key[1])))
+    values = {key: [] for key in keys}
+    current = opening
+    balance = opening_balance
+    for point, snapshot in zip(points, snapshots):
+        balance += point["income"] - point["expense"]
+        point["balance"] = balance
+        current.update(snapshot)
+        for key in keys:
+            values[key].append(current.get(key, Decimal(0)))
+
+    category_ids = [key[1] for key in keys if key[1] is not None]
+    categories = {}
+    if category_ids:
+        result = await session.execute(
+            select(Category.id, Category.name, Category.color).where(
+                Category.id.in_(category_ids)
+            )
+        )
+        categories = {row.id: row for row in result}
+
+    return {
+        "opening_balance": opening_balance,
+        "points": points,
+        "categories": [
+            {
+                "id": category_id,
+                "name": (
+                    categories[category_id].name
+                    if category_id in categories
+                    else SERIES_EMPTY_NAMES["category"]
+                ),
+                "color": (
+                    categories[category_id].color if category_id in categories else None
+                ),
+                "record_type": type_names[type_id],
+                "values": values[(type_id, category_id)],
+            }
+            for type_id, category_id in keys
+        ],
+    }
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from src.config import STATS_DASHBOARD_CONCURRENCY
+from src.database.core.db import async_session_maker
+from src.stats.cache import cached_stats
+from src.stats.database import categories_month_summary
+from src.stats.results import month_stats_result, trend_result, trend_series_result
+from src.schemas import (
+    DashboardMonthStatDTO,
+    DashboardResultDTO,
+    DashboardTrendSeriesStatDTO,
+    DashboardTrendStatDTO,
+)
+
+# Индекс колонки в строке categories_month_summary для каждой статистики
+MONTH_STAT_COLUMNS = {"categories-month-sum": 0, "categories-month-count": 1}
+
+
+class Dashboard:
+    """
+    Пакетное вычисление нескольких статистик за один запрос.
+
+    Статистики считаются параллельно, каждый запрос к БД выполняется в
+    собственной сессии из пула (не более STATS_DASHBOARD_CONCURRENCY
+    одновременно). Сумма и количество за один месяц и тип записи
+    вычисляются общим GROUP BY. Результаты кэшируются с теми же ключами,
+    что и у одиночных эндпоинтов статистики.
+    """
+
+    def __init__(self, current_user_uuid: UUID):
+        self.current_user_uuid = current_user_uuid
+        self._semaphore = asyncio.Semaphore(STATS_DASHBOARD_CONCURRENCY)
+        self._month_summaries: dict[tuple, asyncio.Future] = {}
+
+    async def _run(self, query: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Выполнение запроса статистики в отдельной сессии"""
+        async with self._semaphore:
+            async with async_session_maker() as session:
+                return await query(session, self.current_user_uuid, *args)
+
+    def _month_summary(self, record_type_name: str, month: int, year: int) -> asyncio.Future:
+        """Общий для суммы и количества запрос месячной статистики"""
+        key = (record_type_name, month, year)
+        if key not in self._month_summaries:
+            self._month_summaries[key] = asyncio.ensure_future(
+                self._run(categories_month_summary, record_type_name, month, year)
+            )
+        return self._month_summaries[key]
+
+    async def _compute(self, spec) -> Any:
+        if isinstance(spec, DashboardMonthStatDTO):
+            params = {"month": spec.month, "year": spec.year}
+
+            async def compute():
+                rows = await self._month_summary(
+                    spec.record_type_name, spec.month, spec.year
+                )
+                return month_stats_result(rows, MONTH_STAT_COLUMNS[spec.stat])
+
+        elif isinstance(spec, DashboardTrendStatDTO):
+            params = spec.filters.model_dump(mode="json")
+
+            async def compute():
+                return await self._run(trend_result, spec.record_type_name, spec.filters)
+
+        elif isinstance(spec, DashboardTrendSeriesStatDTO):
+            params = spec.filters.model_dump(mode="json")
+
+            async def compute():
+                return await self._run(
+                    trend_series_result, spec.record_type_name, spec.filters
+                )
+
+        else:
+            raise ValueError(f"Unknown stat: {spec.stat}")
+
+        return await cached_stats(
+            self.current_user_uuid, spec.record_type_name, spec.stat, params, compute
+        )
+
+    async def compute(self, specs: list) -> list[dict[str, Any]]:
+        """
+        Вычисление всех статистик.
+
+        :param specs: Список описаний статистик из DashboardBodyDTO
+        :return: Результаты в порядке описаний
+        """
+        try:
+            results = await asyncio.gather(*(self._compute(spec) for spec in specs))
+        finally:
+            for future in self._month_summaries.values():
+                future.cancel()
+        return [
+            DashboardResultDTO(
+                stat=spec.stat, record_type_name=spec.record_type_name, data=data
+            ).model_dump(mode="json")
+            for spec, data in zip(specs, results)
+        ]
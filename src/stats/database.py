@@ -1,10 +1,65 @@
 from uuid import UUID
 
-from sqlalchemy import and_, exists, select, func, cast, text, Date
-from sqlalchemy.dialects.postgresql import INTERVAL
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import (
+    select,
+    func,
+    case,
+    cast,
+    literal,
+    literal_column,
+    null,
+    true,
+    Date,
+    Float,
+    Integer,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.models import Record, Category, RecordType, RecordTag
-from datetime import date
+from src.models import Record, Category, DailyRecordTotal, RecordType, RecordTag, Tag, Unit
+from datetime import date, timedelta
+
+
+def month_bounds(month: int, year: int) -> tuple[date, date]:
+    """Полуинтервал [начало месяца, начало следующего месяца)"""
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start_date, end_date
+
+
+def month_aggregates(record_type_name: str) -> dict:
+    """
+    Агрегаты месячной статистики по дневным итогам.
+
+    :param record_type_name: Тип записи (income/expense)
+    :return: Словарь {тип статистики: агрегатное выражение}
+    """
+    return {
+        "sum": (
+            func.sum(DailyRecordTotal.amount_sum)
+            if record_type_name == "income"
+            else func.sum(DailyRecordTotal.amount_qty_sum)
+        ),
+        "count": func.sum(DailyRecordTotal.record_count),
+    }
+
+
+def categories_month_stmt(
+    current_user_uuid: UUID, record_type_name: str, month: int, year: int, *columns
+):
+    """Запрос по категориям за месяц из дневных итогов с заданными агрегатами"""
+    start_date, end_date = month_bounds(month, year)
+    return (
+        select(*columns, Category.name, Category.color)
+        .join(Category, DailyRecordTotal.category_id == Category.id)
+        .join(RecordType, DailyRecordTotal.record_type_id == RecordType.id)
+        .where(
+            DailyRecordTotal.user_id == current_user_uuid,
+            RecordType.name == record_type_name,
+            DailyRecordTotal.record_date >= start_date,
+            DailyRecordTotal.record_date < end_date,
+        )
+        .group_by(Category.color, Category.name)
+    )
 
 
 async def categories_month_stats(
@@ -15,108 +70,615 @@ async def categories_month_stats(
     month: int,
     year: int,
 ):
-    # Определение временного диапазона для статистики (весь указанный месяц)
-    start_date = date(year, month, 1)
-    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
-    # Выбор агрегатной функции в зависимости от типа статистики
-    if stats_type == "sum":
-        aggregate = (
-            func.sum(Record.amount)
-            if record_type_name == "income"
-            else func.sum(
-                Record.amount * Record.product_quantity
-            )
-        )
-    elif stats_type == "count":
-        aggregate = func.count(Record.id)
-    else:
+    # Выбор агрегатной функции в зависимости от типа статистики;
+    # данные берутся из дневных итогов, а не из сырых записей
+    aggregate = month_aggregates(record_type_name).get(stats_type)
+    if aggregate is None:
         raise Exception("неверный тип")
-    # Формирование базового запроса с джойнами и фильтрами
-    stmt = (
-        select(aggregate.label("stats"), Category.name, Category.color)
-        .join(Category, Record.category_id == Category.id)
-        .join(RecordType, Record.record_type_id == RecordType.id)
-        .where(
-            Record.user_id == current_user_uuid,
-            RecordType.name == record_type_name,
-            Record.record_date >= start_date,
-            Record.record_date < end_date,
-        )
-        .group_by(Category.color, Category.name)
-        .having(aggregate > 0)
-    )
+    stmt = categories_month_stmt(
+        current_user_uuid, record_type_name, month, year, aggregate.label("stats")
+    ).having(aggregate > 0)
 
     result = await session.execute(stmt)
     return result.all()
 
 
-async def trend(
+async def categories_month_summary(
     session: AsyncSession,
     current_user_uuid: UUID,
     record_type_name: str,
-    filters,
-    steps: int = 10,
+    month: int,
+    year: int,
 ):
-    # Расчет временных интервалов для группировки данных
-    total_days = (filters.end_date - filters.start_date).days
-    step_days = ((total_days + steps - 1) // steps) if steps > 0 else 1
-    # Генерация временных меток начала интервалов через generate_series
-    date_series = select(
-        func.generate_series(
-            filters.start_date,
-            filters.end_date,
-            cast(text(f"'{step_days} day'"), INTERVAL),
-        ).label("window_start")
-    ).cte("start_dates")
-    # Определение оконных интервалов (начало и конец)
-    date_windows = select(
-        date_series.c.window_start,
-        (
-            date_series.c.window_start + cast(text(f"'{step_days-1} day'"), INTERVAL)
-        ).label("window_end"),
-    ).cte("date_windows")
-    # Выбор формулы расчета суммы в зависимости от типа записи
-    if record_type_name == "income":
-        amount_expr = func.coalesce(func.sum(Record.amount), 0)
-    elif record_type_name == "expense":
-        amount_expr = func.coalesce(
-            func.sum(Record.amount * Record.product_quantity), 0
-        )
-    # Базовые условия соединения записей с временными окнами
-    join_conditions = [
-        Record.record_date >= date_windows.c.window_start,
-        Record.record_date <= date_windows.c.window_end,
-        Record.user_id == current_user_uuid,
-        Record.record_type_id == (
+    """
+    Сумма и количество по категориям за месяц одним GROUP BY.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param current_user_uuid: UUID пользователя
+    :param record_type_name: Тип записи (income/expense)
+    :param month: Месяц
+    :param year: Год
+    :return: Строки (sum, count, category_name, color)
+    """
+    aggregates = month_aggregates(record_type_name)
+    stmt = categories_month_stmt(
+        current_user_uuid,
+        record_type_name,
+        month,
+        year,
+        aggregates["sum"].label("sum"),
+        aggregates["count"].label("count"),
+    )
+
+    result = await session.execute(stmt)
+    return result.all()
+
+
+# Шаг календарных интервалов для заполнения пустых периодов
+GRANULARITY_STEPS = {
+    "day": relativedelta(days=1),
+    "week": relativedelta(weeks=1),
+    "month": relativedelta(months=1),
+    "quarter": relativedelta(months=3),
+    "year": relativedelta(years=1),
+}
+
+
+def truncate_date(value: date, granularity: str) -> date:
+    """Аналог date_trunc в Python: начало периода, содержащего дату"""
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    if granularity == "quarter":
+        return value.replace(month=(value.month - 1) // 3 * 3 + 1, day=1)
+    if granularity == "year":
+        return value.replace(month=1, day=1)
+    return value
+
+
+def trend_source(
+    current_user_uuid: UUID, record_type_name: str, filters, raw: bool = False
+):
+    """
+    Выбор источника данных для тренда и условий выборки.
+
+    Фильтры по тегам и единицам требуют сырых записей, в остальных
+    случаях достаточно дневных итогов.
+
+    :param raw: Принудительно использовать сырые записи
+    :return: Кортеж (модель-источник, выражение суммы, список условий)
+    """
+    if raw or filters.tags or filters.units:
+        source = Record
+        amount_column = (
+            Record.amount
+            if record_type_name == "income"
+            else Record.amount * Record.product_quantity
+        )
+    else:
+        source = DailyRecordTotal
+        amount_column = (
+            DailyRecordTotal.amount_sum
+            if record_type_name == "income"
+            else DailyRecordTotal.amount_qty_sum
+        )
+
+    conditions = [
+        source.user_id == current_user_uuid,
+        source.record_type_id == (
             select(RecordType.id)
             .where(RecordType.name == record_type_name)
             .scalar_subquery()
-        )
+        ),
+        source.record_date >= filters.start_date,
+        source.record_date <= filters.end_date,
     ]
     # Добавление дополнительных фильтров при наличии
     if filters.categories:
-        join_conditions.append(Record.category_id.in_(filters.categories))
+        conditions.append(source.category_id.in_(filters.categories))
     if filters.tags:
-        join_conditions.append(Record.id.in_(
-            select(RecordTag.record_id)
-            .where(RecordTag.tag_id.in_(filters.tags))
-        ))
+        # Операторы массива по record.tag_ids обслуживаются GIN-индексом
+        tag_ids = list(set(filters.tags))
+        conditions.append(
+            Record.tag_ids.contains(tag_ids)
+            if filters.tag_mode == "all"
+            else Record.tag_ids.overlap(tag_ids)
+        )
     if filters.units:
-        join_conditions.append(Record.unit_id.in_(filters.units))
-    # Основной запрос с OUTER JOIN для сохранения всех временных интервалов
+        conditions.append(Record.unit_id.in_(filters.units))
+
+    return source, amount_column, conditions
+
+
+def trend_buckets(filters):
+    """
+    Выражение периода записи и начала всех периодов диапазона.
+
+    При заданной granularity период считается через date_trunc, иначе
+    диапазон делится на filters.steps равных окон и номер окна
+    вычисляется арифметически от start_date.
+
+    :return: Кортеж (функция модель -> SQL-выражение периода,
+        функция значение периода -> дата начала, список дат начала периодов)
+    """
+    if filters.granularity:
+        step = GRANULARITY_STEPS[filters.granularity]
+        starts = []
+        current = truncate_date(filters.start_date, filters.granularity)
+        while current <= filters.end_date:
+            starts.append(current)
+            current += step
+
+        def bucket(source):
+            return cast(func.date_trunc(filters.granularity, source.record_date), Date)
+
+        return bucket, lambda value: value, starts
+
+    total_days = (filters.end_date - filters.start_date).days
+    step_days = max((total_days + filters.steps - 1) // filters.steps, 1)
+    starts = [
+        filters.start_date + timedelta(days=offset)
+        for offset in range(0, total_days + 1, step_days)
+    ]
+
+    def bucket(source):
+        return (source.record_date - filters.start_date) // step_days
+
+    return bucket, lambda value: filters.start_date + timedelta(days=value * step_days), starts
+
+
+def trend_query(current_user_uuid: UUID, record_type_name: str, filters):
+    """
+    SELECT тренда: суммы, сгруппированные по выражению периода.
+
+    :return: Кортеж (запрос, функция значение периода -> дата начала,
+        список дат начала периодов)
+    """
+    source, amount_column, conditions = trend_source(
+        current_user_uuid, record_type_name, filters
+    )
+    bucket, bucket_start, starts = trend_buckets(filters)
+
+    bucket_expr = bucket(source).label("bucket")
     query = (
+        select(bucket_expr, func.sum(amount_column).label("amount_sum"))
+        .where(*conditions)
+        .group_by(bucket_expr)
+    )
+    return query, bucket_start, starts
+
+
+async def trend(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Тренд сумм по периодам за один проход GROUP BY.
+
+    Период каждой строки вычисляется выражением, пустые периоды
+    заполняются нулями в Python. Все значения передаются параметрами,
+    поэтому текст запроса не зависит от дат и количества шагов.
+
+    :return: Список кортежей (начало периода, сумма)
+    """
+    query, bucket_start, starts = trend_query(
+        current_user_uuid, record_type_name, filters
+    )
+    result = await session.execute(query)
+
+    sums = {bucket_start(value): amount or 0 for value, amount in result}
+    return [(start, sums.get(start, 0)) for start in starts]
+
+
+# Подписи серий для строк без группы и для объединенного остатка
+SERIES_EMPTY_NAMES = {
+    "category": "Без категории",
+    "tag": "Без тегов",
+    "unit": "Без единицы",
+}
+SERIES_OTHER_NAME = "Другое"
+
+
+async def trend_series(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Тренд по периодам в разрезе категорий, тегов или единиц.
+
+    Матрица группа x период считается одним GROUP BY, при заданном
+    filters.top остальные группы объединяются в серию "Другое".
+
+    :return: Кортеж (список дат начала периодов, список серий-словарей
+        с ключами id, name, color, values, total)
+    """
+    source, amount_column, conditions = trend_source(
+        current_user_uuid,
+        record_type_name,
+        filters,
+        raw=filters.group_by != "category",
+    )
+    bucket, bucket_start, starts = trend_buckets(filters)
+    bucket_expr = bucket(source).label("bucket")
+
+    if filters.group_by == "category":
+        group = (Category.id, Category.name, Category.color)
+        query = select(bucket_expr, *group, func.sum(amount_column)).outerjoin(
+            Category, source.category_id == Category.id
+        )
+    elif filters.group_by == "unit":
+        group = (Unit.id, Unit.name)
+        query = select(bucket_expr, *group, null(), func.sum(amount_column)).outerjoin(
+            Unit, Record.unit_id == Unit.id
+        )
+    else:
+        group = (Tag.id, Tag.name, Tag.color)
+        query = (
+            select(bucket_expr, *group, func.sum(amount_column))
+            .select_from(Record)
+            .outerjoin(RecordTag, RecordTag.record_id == Record.id)
+            .outerjoin(Tag, RecordTag.tag_id == Tag.id)
+        )
+    query = query.where(*conditions).group_by(bucket_expr, *group)
+    result = await session.execute(query)
+
+    positions = {start: idx for idx, start in enumerate(starts)}
+    series = {}
+    for value, group_id, name, color, amount in result:
+        item = series.setdefault(
+            group_id,
+            {
+                "id": group_id,
+                "name": name or SERIES_EMPTY_NAMES[filters.group_by],
+                "color": color,
+                "values": [0.0] * len(starts),
+                "total": 0.0,
+            },
+        )
+        amount = float(amount or 0)
+        item["values"][positions[bucket_start(value)]] += amount
+        item["total"] += amount
+
+    ranked = sorted(series.values(), key=lambda item: item["total"], reverse=True)
+    if filters.top is not None and len(ranked) > filters.top:
+        other = {
+            "id": None,
+            "name": SERIES_OTHER_NAME,
+            "color": None,
+            "values": [0.0] * len(starts),
+            "total": 0.0,
+        }
+        for item in ranked[filters.top:]:
+            other["values"] = [a + b for a, b in zip(other["values"], item["values"])]
+            other["total"] += item["total"]
+        ranked = ranked[:filters.top] + [other]
+
+    return starts, ranked
+
+
+# Окна скользящих средних (в месяцах) для сравнения периодов
+COMPARISON_WINDOWS = (3, 6, 12)
+
+
+async def categories_month_comparison(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    stats_type: str,
+    month: int,
+    year: int,
+):
+    """
+    Сравнение месяца с предыдущим, тем же месяцем прошлого года и
+    скользящими средними по категориям.
+
+    Дневные итоги за 13 месяцев один раз группируются по месяцам (CTE),
+    сетка месяцы x категории дополняется нулями, после чего значения
+    прошлых периодов берутся оконными функциями lag/avg.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param current_user_uuid: UUID пользователя
+    :param record_type_name: Тип записи (income/expense)
+    :param stats_type: Тип статистики (sum/count)
+    :param month: Месяц
+    :param year: Год
+    :return: Строки (category_name, color, current, previous, year_ago,
+        avg_3, avg_6, avg_12)
+    """
+    aggregate = month_aggregates(record_type_name).get(stats_type)
+    if aggregate is None:
+        raise Exception("неверный тип")
+
+    current_start, end_date = month_bounds(month, year)
+    range_start = current_start - relativedelta(months=max(COMPARISON_WINDOWS))
+    record_type_id = (
+        select(RecordType.id)
+        .where(RecordType.name == record_type_name)
+        .scalar_subquery()
+    )
+    bucket = cast(func.date_trunc("month", DailyRecordTotal.record_date), Date)
+
+    monthly = (
+        select(
+            bucket.label("month"),
+            DailyRecordTotal.category_id,
+            aggregate.label("value"),
+        )
+        .where(
+            DailyRecordTotal.user_id == current_user_uuid,
+            DailyRecordTotal.record_type_id == record_type_id,
+            DailyRecordTotal.record_date >= range_start,
+            DailyRecordTotal.record_date < end_date,
+        )
+        .group_by(bucket, DailyRecordTotal.category_id)
+        .cte("monthly")
+    )
+    months = (
+        select(
+            cast(
+                func.generate_series(
+                    range_start, current_start, literal_column("interval '1 month'")
+                ),
+                Date,
+            ).label("month")
+        )
+        .subquery("months")
+    )
+    categories = (
+        select(Category.id, Category.name, Category.color)
+        .where(Category.id.in_(select(monthly.c.category_id)))
+        .subquery("categories")
+    )
+
+    value = func.coalesce(monthly.c.value, 0)
+    window = {"partition_by": categories.c.id, "order_by": months.c.month}
+    columns = [
+        months.c.month,
+        categories.c.name,
+        categories.c.color,
+        value.label("current"),
+        func.lag(value, 1).over(**window).label("previous"),
+        func.lag(value, 12).over(**window).label("year_ago"),
+    ]
+    for size in COMPARISON_WINDOWS:
+        columns.append(
+            func.avg(value)
+            .over(**window, rows=(-size, -1))
+            .label(f"avg_{size}")
+        )
+    dense = (
+        select(*columns)
+        .select_from(months)
+        .join(categories, true())
+        .outerjoin(
+            monthly,
+            (monthly.c.month == months.c.month)
+            & (monthly.c.category_id == categories.c.id),
+        )
+        .subquery("dense")
+    )
+
+    stmt = (
+        select(*[c for c in dense.c if c.key != "month"])
+        .where(dense.c.month == current_start)
+        .order_by(dense.c.current.desc(), dense.c.name)
+    )
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def categories_percentiles(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Медиана и 90-й перцентиль суммы записи по категориям.
+
+    Считается одним GROUP BY с percentile_cont по сырым записям с
+    непустой суммой.
+
+    :return: Строки (category_name, color, median, p90, count)
+    """
+    _, amount_column, conditions = trend_source(
+        current_user_uuid, record_type_name, filters, raw=True
+    )
+    # Расходы без количества не имеют суммы и в перцентили не входят
+    conditions.append(amount_column.is_not(None))
+    median = func.percentile_cont(0.5).within_group(amount_column).label("median")
+    stmt = (
+        select(
+            Category.name,
+            Category.color,
+            median,
+            func.percentile_cont(0.9).within_group(amount_column).label("p90"),
+            func.count().label("count"),
+        )
+        .select_from(Record)
+        .outerjoin(Category, Record.category_id == Category.id)
+        .where(*conditions)
+        .group_by(Category.id, Category.name, Category.color)
+        .order_by(median.desc())
+    )
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def amount_histogram(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Гистограмма сумм записей с filters.bins корзинами равной ширины.
+
+    Границы берутся из filters.min_amount/max_amount или из минимума и
+    максимума выборки; номер корзины вычисляет width_bucket, значение,
+    равное верхней границе, попадает в последнюю корзину.
+
+    :return: Кортеж (нижняя граница, верхняя граница, {номер корзины: количество})
+        или None, если подходящих записей нет
+    """
+    _, amount_column, conditions = trend_source(
+        current_user_uuid, record_type_name, filters, raw=True
+    )
+    # Без записей с пустой суммой границы min/max не бывают NULL
+    conditions.append(amount_column.is_not(None))
+    if filters.min_amount is not None:
+        conditions.append(amount_column >= filters.min_amount)
+    if filters.max_amount is not None:
+        conditions.append(amount_column <= filters.max_amount)
+
+    amounts = select(amount_column.label("value")).where(*conditions).cte("amounts")
+    low = (
+        literal(filters.min_amount, Float)
+        if filters.min_amount is not None
+        else func.min(amounts.c.value)
+    )
+    high = (
+        literal(filters.max_amount, Float)
+        if filters.max_amount is not None
+        else func.max(amounts.c.value)
+    )
+    bounds = select(low.label("low"), high.label("high")).select_from(amounts).cte("bounds")
+    # width_bucket не допускает совпадающих границ
+    upper = case((bounds.c.high > bounds.c.low, bounds.c.high), else_=bounds.c.low + 1)
+    bucket = func.least(
+        func.width_bucket(amounts.c.value, bounds.c.low, upper, filters.bins),
+        filters.bins,
+    )
+    stmt = (
         select(
-            func.cast(date_windows.c.window_start, Date).label("date"),
-            amount_expr.label("amount_sum"),
+            bucket.label("bucket"),
+            bounds.c.low,
+            upper.label("high"),
+            func.count().label("count"),
         )
-        .select_from(
-            date_windows.outerjoin(
-                Record,
-                and_(*join_conditions),
-            )
+        .select_from(amounts)
+        .join(bounds, true())
+        .group_by(bucket, bounds.c.low, upper)
+    )
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        return None
+    return rows[0].low, rows[0].high, {row.bucket: row.count for row in rows}
+
+
+async def weekday_heatmap(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Суммы и количество записей по дням недели (extract dow, 0 - воскресенье)
+    в разрезе категорий.
+
+    Без фильтров по тегам и единицам считается по дневным итогам.
+
+    :return: Строки (category_name, color, weekday, amount_sum, count)
+    """
+    source, amount_column, conditions = trend_source(
+        current_user_uuid, record_type_name, filters
+    )
+    count = (
+        func.sum(DailyRecordTotal.record_count)
+        if source is DailyRecordTotal
+        else func.count()
+    )
+    weekday = cast(func.extract("dow", source.record_date), Integer)
+    stmt = (
+        select(
+            Category.name,
+            Category.color,
+            weekday.label("weekday"),
+            func.sum(amount_column).label("amount_sum"),
+            count.label("count"),
         )
-        .group_by(date_windows.c.window_start)
-        .order_by(date_windows.c.window_start)
+        .select_from(source)
+        .outerjoin(Category, source.category_id == Category.id)
+        .where(*conditions)
+        .group_by(Category.id, Category.name, Category.color, weekday)
+        .order_by(Category.name, weekday)
     )
-    print(query)
-    return await session.execute(query)
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def price_history(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    История цены за единицу (amount / unit_quantity) одного продукта.
+
+    Имя сравнивается без учета регистра по lower(name), что позволяет
+    использовать индекс idx_record_user_product (user_id, lower(name),
+    record_date). Записи без unit_quantity пропускаются.
+
+    :return: Строки (record_date, unit, unit_price, min_unit_price,
+        max_unit_price, count) по дням и единицам
+    """
+    _, _, conditions = trend_source(
+        current_user_uuid, record_type_name, filters, raw=True
+    )
+    unit_price = Record.amount / func.nullif(Record.unit_quantity, 0)
+    stmt = (
+        select(
+            Record.record_date,
+            Unit.name.label("unit"),
+            func.avg(unit_price).label("unit_price"),
+            func.min(unit_price).label("min_unit_price"),
+            func.max(unit_price).label("max_unit_price"),
+            func.count().label("count"),
+        )
+        .outerjoin(Unit, Record.unit_id == Unit.id)
+        .where(
+            *conditions,
+            func.lower(Record.name) == filters.name.strip().lower(),
+            Record.unit_quantity > 0,
+        )
+        .group_by(Record.record_date, Unit.name)
+        .order_by(Record.record_date, Unit.name)
+    )
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def top_products(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters,
+):
+    """
+    Продукты с наибольшей суммой за период.
+
+    Записи группируются по lower(name), в качестве названия
+    возвращается одно из исходных написаний.
+
+    :return: Строки (name, amount_sum, count)
+    """
+    _, amount_column, conditions = trend_source(
+        current_user_uuid, record_type_name, filters, raw=True
+    )
+    product = func.lower(Record.name)
+    amount_sum = func.sum(amount_column).label("amount_sum")
+    stmt = (
+        select(func.min(Record.name).label("name"), amount_sum, func.count().label("count"))
+        .where(*conditions)
+        .group_by(product)
+        .order_by(amount_sum.desc())
+        .limit(filters.limit)
+    )
+    result = await session.execute(stmt)
+    return result.all()
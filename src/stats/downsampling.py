@@ -0,0 +1,65 @@
+from datetime import date
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Индексы точек, выбранных алгоритмом Largest-Triangle-Three-Buckets.
+
+    Первая и последняя точки сохраняются, внутренние точки делятся на
+    max_points - 2 корзины, из каждой берется точка, образующая
+    треугольник наибольшей площади с уже выбранной точкой и средним
+    следующей корзины. Средние всех корзин считаются через cumsum,
+    площади внутри корзины - векторно.
+
+    :param x: Координаты X (возрастающие)
+    :param y: Значения
+    :param max_points: Максимальное количество точек (не меньше 3)
+    :return: Массив индексов выбранных точек по возрастанию
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = ends - starts
+    mean_x = (cum_x[ends] - cum_x[starts]) / sizes
+    mean_y = (cum_y[ends] - cum_y[starts]) / sizes
+    # Для последней корзины опорной служит последняя точка ряда
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(max_points - 2):
+        start, end = starts[bucket], ends[bucket]
+        area = np.abs(
+            (x[anchor] - next_x[bucket]) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (next_y[bucket] - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample_series(
+    points: list[tuple[date, float]], max_points: int
+) -> list[tuple[date, float]]:
+    """
+    Прореживание временного ряда до max_points точек методом LTTB.
+
+    :param points: Список кортежей (дата, значение) по возрастанию даты
+    :param max_points: Максимальное количество точек
+    :return: Подмножество исходных точек
+    """
+    if len(points) <= max_points:
+        return points
+    x = np.fromiter((point[0].toordinal() for point in points), dtype=np.float64)
+    y = np.fromiter((float(point[1]) for point in points), dtype=np.float64)
+    return [points[idx] for idx in lttb_indices(x, y, max_points)]
@@ -1,14 +1,46 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import Body, Depends, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.auth_config import fastapi_auth
 from src.database.core.db import get_async_session
-from src.stats.database import categories_month_stats, trend
+from src.stats.cache import cached_stats
+from src.stats.cashflow import cashflow
+from src.stats.dashboard import Dashboard
+from src.stats.database import (
+    amount_histogram,
+    categories_month_comparison,
+    categories_month_stats,
+    categories_percentiles,
+    price_history,
+    top_products,
+    weekday_heatmap,
+)
+from src.stats.results import (
+    comparison_result,
+    heatmap_result,
+    histogram_result,
+    month_stats_result,
+    percentiles_result,
+    price_history_result,
+    top_products_result,
+    trend_result,
+    trend_series_result,
+)
 from src.models import User
 
-from src.schemas import CategoryMonthStatsDTO, TrendBodyDTO, TrendDTO
+from src.schemas import (
+    CashflowDTO,
+    DashboardBodyDTO,
+    DateRangeBodyDTO,
+    HistogramBodyDTO,
+    PriceHistoryBodyDTO,
+    StatsFilterBodyDTO,
+    TopProductsBodyDTO,
+    TrendBodyDTO,
+    TrendSeriesBodyDTO,
+)
 
 current_user = fastapi_auth.current_user()
 
@@ -21,18 +53,48 @@ def create_stat_endpoint(stat_type: str):
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(current_user),
     ):
-        stat_results = await categories_month_stats(
-            session, current_user.id, record_type_name, stat_type, month, year
+        async def compute():
+            stat_results = await categories_month_stats(
+                session, current_user.id, record_type_name, stat_type, month, year
+            )
+            return month_stats_result(stat_results)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            f"categories-month-{stat_type}",
+            {"month": month, "year": year},
+            compute,
         )
 
-        return [
-            CategoryMonthStatsDTO(
-                category=category_name, stats=float(stats), color=color
+    endpoint.__name__ = f"get_categories_month_{stat_type}"
+    return endpoint
+
+
+def create_comparison_endpoint():
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        month: Annotated[int, Query(ge=1, le=12)],
+        year: Annotated[int, Query(ge=1900)],
+        stat_type: Annotated[Literal["sum", "count"], Query()] = "sum",
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            rows = await categories_month_comparison(
+                session, current_user.id, record_type_name, stat_type, month, year
             )
-            for stats, category_name, color in stat_results
-        ]
+            return comparison_result(rows)
 
-    endpoint.__name__ = f"get_categories_month_{stat_type}"
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "categories-month-comparison",
+            {"month": month, "year": year, "stat_type": stat_type},
+            compute,
+        )
+
+    endpoint.__name__ = "get_categories_month_comparison"
     return endpoint
 
 
@@ -43,8 +105,179 @@ def create_trend_endpont():
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(current_user),
     ):
-        result = await trend(session, current_user.id, record_type_name, filters)
-        return [TrendDTO(date=d, amount_sum=a) for d, a in result]
+        async def compute():
+            return await trend_result(session, current_user.id, record_type_name, filters)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "trend",
+            filters.model_dump(mode="json"),
+            compute,
+        )
 
     endpoint.__name__ = "get_income_expense_trend"
     return endpoint
+
+
+def create_trend_series_endpoint():
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        filters: Annotated[TrendSeriesBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            return await trend_series_result(
+                session, current_user.id, record_type_name, filters
+            )
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "trend-series",
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = "get_trend_series"
+    return endpoint
+
+
+def create_distribution_endpoint(stat_type: str):
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        filters: Annotated[StatsFilterBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            if stat_type == "percentiles":
+                rows = await categories_percentiles(
+                    session, current_user.id, record_type_name, filters
+                )
+                return percentiles_result(rows)
+            rows = await weekday_heatmap(
+                session, current_user.id, record_type_name, filters
+            )
+            return heatmap_result(rows)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            stat_type,
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = f"get_{stat_type}"
+    return endpoint
+
+
+def create_histogram_endpoint():
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        filters: Annotated[HistogramBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            histogram = await amount_histogram(
+                session, current_user.id, record_type_name, filters
+            )
+            return histogram_result(histogram, filters.bins)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "histogram",
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = "get_histogram"
+    return endpoint
+
+
+def create_price_history_endpoint():
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        filters: Annotated[PriceHistoryBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            rows = await price_history(
+                session, current_user.id, record_type_name, filters
+            )
+            return price_history_result(rows)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "price-history",
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = "get_price_history"
+    return endpoint
+
+
+def create_top_products_endpoint():
+    async def endpoint(
+        record_type_name: Annotated[str, Path()],
+        filters: Annotated[TopProductsBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            rows = await top_products(
+                session, current_user.id, record_type_name, filters
+            )
+            return top_products_result(rows)
+
+        return await cached_stats(
+            current_user.id,
+            record_type_name,
+            "top-products",
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = "get_top_products"
+    return endpoint
+
+
+def create_cashflow_endpoint():
+    async def endpoint(
+        filters: Annotated[DateRangeBodyDTO, Body()],
+        session: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(current_user),
+    ):
+        async def compute():
+            result = await cashflow(session, current_user.id, filters)
+            return CashflowDTO.model_validate(result).model_dump(mode="json")
+
+        return await cached_stats(
+            current_user.id,
+            "all",
+            "cashflow",
+            filters.model_dump(mode="json"),
+            compute,
+        )
+
+    endpoint.__name__ = "get_cashflow"
+    return endpoint
+
+
+def create_dashboard_endpoint():
+    # Сессия не берется из зависимости: каждая статистика получает свою
+    async def endpoint(
+        body: Annotated[DashboardBodyDTO, Body()],
+        current_user: User = Depends(current_user),
+    ):
+        return await Dashboard(current_user.id).compute(body.stats)
+
+    endpoint.__name__ = "get_dashboard"
+    return endpoint
@@ -0,0 +1,86 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import UUID, ForeignKey, Index, Integer, Numeric, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.core.db import Base
+
+
+class DailyRecordTotal(Base):
+    """
+    Дневные итоги записей по пользователю, типу записи и категории.
+
+    Поддерживается триггером на таблице record (миграция
+    daily_record_totals), полностью пересчитывается командой
+    python -m src.stats.rebuild.
+    """
+
+    __tablename__ = "daily_record_totals"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    record_date: Mapped[date]
+    # Сумма amount (доходы) и сумма amount * product_quantity (расходы);
+    # numeric, чтобы дельты триггера не накапливали ошибку округления
+    amount_sum: Mapped[Decimal] = mapped_column(Numeric, default=0)
+    amount_qty_sum: Mapped[Decimal] = mapped_column(Numeric, default=0)
+    record_count: Mapped[int] = mapped_column(default=0)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID, ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    record_type_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("record_type.id"), nullable=False
+    )
+    # Без внешнего ключа: при удалении категории триггер сам переносит
+    # итоги в строку без категории (record.category_id -> NULL)
+    category_id: Mapped[uuid.UUID | None] = mapped_column(UUID, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_daily_record_totals",
+            "user_id",
+            "record_type_id",
+            "record_date",
+            text("coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid)"),
+            unique=True,
+        ),
+    )
+
+
+class BalanceCheckpoint(Base):
+    """
+    Накопленные итоги по типу записи и категории на конец месяца.
+
+    Строится по дневным итогам при запросе баланса (src.stats.cashflow).
+    Триггер на daily_record_totals удаляет контрольные точки пользователя,
+    начиная с месяца измененной даты, поэтому сохранившиеся точки всегда
+    образуют непрерывный и актуальный префикс истории.
+    """
+
+    __tablename__ = "balance_checkpoint"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # Первое число месяца, итоги включают весь месяц
+    month: Mapped[date]
+    cumulative_sum: Mapped[Decimal] = mapped_column(Numeric, default=0)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID, ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    record_type_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("record_type.id"), nullable=False
+    )
+    category_id: Mapped[uuid.UUID | None] = mapped_column(UUID, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_balance_checkpoint",
+            "user_id",
+            "month",
+            "record_type_id",
+            text("coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid)"),
+            unique=True,
+        ),
+    )
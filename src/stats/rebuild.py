@@ -0,0 +1,79 @@
+"""
+Пересчет таблицы daily_record_totals по сырым записям.
+
+Запуск: python -m src.stats.rebuild [--user USER_ID]
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import Numeric, cast, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.core.db import async_session_maker
+from src.models import DailyRecordTotal, Record
+
+
+async def rebuild_daily_totals(session: AsyncSession, user_id: uuid.UUID | None = None):
+    """
+    Полный пересчет дневных итогов (всех или одного пользователя).
+
+    На время пересчета таблица record блокируется от записи, чтобы
+    триггер не изменил итоги между удалением и вставкой.
+
+    :param session: Асинхронная сессия SQLAlchemy
+    :param user_id: UUID пользователя или None для всех пользователей
+    """
+    await session.execute(text("LOCK TABLE record IN SHARE MODE"))
+
+    delete_stmt = delete(DailyRecordTotal)
+    filters = [Record.user_id.is_not(None)]
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(DailyRecordTotal.user_id == user_id)
+        filters.append(Record.user_id == user_id)
+    await session.execute(delete_stmt)
+
+    # Как в триггере: суммирование в numeric, без ошибок округления float
+    amount = cast(Record.amount, Numeric)
+    totals = (
+        select(
+            Record.user_id,
+            Record.record_type_id,
+            Record.category_id,
+            Record.record_date,
+            func.sum(amount),
+            func.coalesce(func.sum(amount * Record.product_quantity), 0),
+            func.count(),
+        )
+        .where(*filters)
+        .group_by(
+            Record.user_id, Record.record_type_id, Record.category_id, Record.record_date
+        )
+    )
+    await session.execute(
+        insert(DailyRecordTotal).from_select(
+            [
+                "user_id",
+                "record_type_id",
+                "category_id",
+                "record_date",
+                "amount_sum",
+                "amount_qty_sum",
+                "record_count",
+            ],
+            totals,
+        )
+    )
+    await session.commit()
+
+
+async def main(user_id: uuid.UUID | None):
+    async with async_session_maker() as session:
+        await rebuild_daily_totals(session, user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересчет daily_record_totals")
+    parser.add_argument("--user", type=uuid.UUID, default=None, help="UUID пользователя")
+    asyncio.run(main(parser.parse_args().user))
@@ -0,0 +1,185 @@
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.stats.database import SERIES_EMPTY_NAMES, trend, trend_series
+from src.stats.downsampling import downsample_series
+from src.schemas import (
+    CategoryComparisonDTO,
+    CategoryMonthStatsDTO,
+    CategoryPercentilesDTO,
+    HeatmapCellDTO,
+    HistogramBinDTO,
+    PricePointDTO,
+    TopProductDTO,
+    TrendBodyDTO,
+    TrendDTO,
+    TrendSeriesBodyDTO,
+    TrendSeriesDTO,
+)
+
+
+def month_stats_result(rows: Sequence[Row], column: int = 0) -> list[dict[str, Any]]:
+    """
+    Преобразование строк месячной статистики в JSON-совместимый ответ.
+
+    :param rows: Строки вида (значение..., category_name, color)
+    :param column: Индекс колонки со значением статистики
+    :return: Список CategoryMonthStatsDTO в виде словарей
+    """
+    return [
+        CategoryMonthStatsDTO(
+            category=row[-2], stats=float(row[column]), color=row[-1]
+        ).model_dump(mode="json")
+        for row in rows
+        if row[column] and row[column] > 0
+    ]
+
+
+def change_percent(current: float, previous: float) -> float | None:
+    """Изменение в процентах (None, если прошлое значение нулевое)"""
+    if not previous:
+        return None
+    return (current - previous) / abs(previous) * 100
+
+
+def comparison_result(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """
+    Преобразование строк categories_month_comparison в JSON-совместимый ответ.
+
+    :param rows: Строки сравнения по категориям
+    :return: Список CategoryComparisonDTO в виде словарей
+    """
+    results = []
+    for row in rows:
+        current = float(row.current or 0)
+        previous = float(row.previous or 0)
+        year_ago = float(row.year_ago or 0)
+        results.append(
+            CategoryComparisonDTO(
+                category=row.name,
+                color=row.color,
+                current=current,
+                previous=previous,
+                change=current - previous,
+                change_percent=change_percent(current, previous),
+                year_ago=year_ago,
+                year_change=current - year_ago,
+                year_change_percent=change_percent(current, year_ago),
+                avg_3=float(row.avg_3 or 0),
+                avg_6=float(row.avg_6 or 0),
+                avg_12=float(row.avg_12 or 0),
+            ).model_dump(mode="json")
+        )
+    return results
+
+
+async def trend_result(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters: TrendBodyDTO,
+) -> list[dict[str, Any]]:
+    """
+    Тренд в виде JSON-совместимого списка TrendDTO.
+
+    При заданном filters.max_points ряд считается по дням и прореживается
+    до max_points точек с сохранением формы.
+    """
+    if filters.max_points is None:
+        result = await trend(session, current_user_uuid, record_type_name, filters)
+    else:
+        daily = filters.model_copy(update={"granularity": "day"})
+        result = downsample_series(
+            await trend(session, current_user_uuid, record_type_name, daily),
+            filters.max_points,
+        )
+    return [TrendDTO(date=d, amount_sum=a).model_dump(mode="json") for d, a in result]
+
+
+async def trend_series_result(
+    session: AsyncSession,
+    current_user_uuid: UUID,
+    record_type_name: str,
+    filters: TrendSeriesBodyDTO,
+) -> dict[str, Any]:
+    """Многосерийный тренд в виде JSON-совместимого TrendSeriesDTO"""
+    periods, series = await trend_series(
+        session, current_user_uuid, record_type_name, filters
+    )
+    return TrendSeriesDTO(periods=periods, series=series).model_dump(mode="json")
+
+
+def percentiles_result(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Строки categories_percentiles в виде списка CategoryPercentilesDTO"""
+    return [
+        CategoryPercentilesDTO(
+            category=row.name or SERIES_EMPTY_NAMES["category"],
+            color=row.color,
+            median=float(row.median),
+            p90=float(row.p90),
+            count=row.count,
+        ).model_dump(mode="json")
+        for row in rows
+    ]
+
+
+def histogram_result(histogram: tuple | None, bins: int) -> list[dict[str, Any]]:
+    """
+    Результат amount_histogram в виде списка HistogramBinDTO.
+
+    Корзины без записей заполняются нулями.
+    """
+    if histogram is None:
+        return []
+    low, high, counts = histogram
+    width = (high - low) / bins
+    return [
+        HistogramBinDTO(
+            start=low + width * (number - 1),
+            end=low + width * number,
+            count=counts.get(number, 0),
+        ).model_dump(mode="json")
+        for number in range(1, bins + 1)
+    ]
+
+
+def heatmap_result(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Строки weekday_heatmap в виде списка HeatmapCellDTO"""
+    return [
+        HeatmapCellDTO(
+            category=row.name or SERIES_EMPTY_NAMES["category"],
+            color=row.color,
+            weekday=row.weekday,
+            amount_sum=float(row.amount_sum or 0),
+            count=int(row.count),
+        ).model_dump(mode="json")
+        for row in rows
+    ]
+
+
+def price_history_result(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Строки price_history в виде списка PricePointDTO"""
+    return [
+        PricePointDTO(
+            date=row.record_date,
+            unit=row.unit,
+            unit_price=float(row.unit_price),
+            min_unit_price=float(row.min_unit_price),
+            max_unit_price=float(row.max_unit_price),
+            count=row.count,
+        ).model_dump(mode="json")
+        for row in rows
+    ]
+
+
+def top_products_result(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Строки top_products в виде списка TopProductDTO"""
+    return [
+        TopProductDTO(
+            name=row.name, amount_sum=float(row.amount_sum or 0), count=row.count
+        ).model_dump(mode="json")
+        for row in rows
+    ]
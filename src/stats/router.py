@@ -1,13 +1,44 @@
 from fastapi import APIRouter
-from .endpoints import create_stat_endpoint, create_trend_endpont
+from .endpoints import (
+    create_cashflow_endpoint,
+    create_comparison_endpoint,
+    create_dashboard_endpoint,
+    create_distribution_endpoint,
+    create_histogram_endpoint,
+    create_price_history_endpoint,
+    create_stat_endpoint,
+    create_trend_endpont,
+    create_top_products_endpoint,
+    create_trend_series_endpoint,
+)
 
-from src.schemas import CategoryMonthStatsDTO, TrendDTO
+from src.schemas import (
+    CashflowDTO,
+    CategoryComparisonDTO,
+    CategoryMonthStatsDTO,
+    CategoryPercentilesDTO,
+    DashboardResultDTO,
+    HeatmapCellDTO,
+    HistogramBinDTO,
+    PricePointDTO,
+    TopProductDTO,
+    TrendDTO,
+    TrendSeriesDTO,
+)
 
 stats_router = APIRouter(
     prefix="/stats",
     tags=["stats"],
 )
 
+stats_router.post("/dashboard", response_model=list[DashboardResultDTO])(
+    create_dashboard_endpoint()
+)
+
+stats_router.post("/cashflow", response_model=CashflowDTO)(
+    create_cashflow_endpoint()
+)
+
 stats_router.get(
     "/{record_type_name}/categories-month-sum",
     response_model=list[CategoryMonthStatsDTO],
@@ -18,6 +49,35 @@ stats_router.get(
     response_model=list[CategoryMonthStatsDTO],
 )(create_stat_endpoint("count"))
 
+stats_router.get(
+    "/{record_type_name}/categories-month-comparison",
+    response_model=list[CategoryComparisonDTO],
+)(create_comparison_endpoint())
+
 stats_router.post("/{record_type_name}/trend", response_model=list[TrendDTO])(
     create_trend_endpont()
 )
+
+stats_router.post(
+    "/{record_type_name}/trend/series", response_model=TrendSeriesDTO
+)(create_trend_series_endpoint())
+
+stats_router.post(
+    "/{record_type_name}/percentiles", response_model=list[CategoryPercentilesDTO]
+)(create_distribution_endpoint("percentiles"))
+
+stats_router.post(
+    "/{record_type_name}/histogram", response_model=list[HistogramBinDTO]
+)(create_histogram_endpoint())
+
+stats_router.post(
+    "/{record_type_name}/heatmap", response_model=list[HeatmapCellDTO]
+)(create_distribution_endpoint("heatmap"))
+
+stats_router.post(
+    "/{record_type_name}/price-history", response_model=list[PricePointDTO]
+)(create_price_history_endpoint())
+
+stats_router.post(
+    "/{record_type_name}/top-products", response_model=list[TopProductDTO]
+)(create_top_products_endpoint())
@@ -1,5 +1,6 @@
+from typing import Annotated, Any, Literal
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import date
 
 
@@ -9,14 +10,182 @@ class CategoryMonthStatsDTO(BaseModel):
     color: str
 
 
-class TrendBodyDTO(BaseModel):
+class DateRangeBodyDTO(BaseModel):
     start_date: date
     end_date: date
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be earlier than start_date")
+        return self
+
+
+class StatsFilterBodyDTO(DateRangeBodyDTO):
     categories: list[UUID] = []
     tags: list[UUID] = []
+    # Любой из тегов (any) или все теги (all)
+    tag_mode: Literal["any", "all"] = "any"
     units: list[UUID] = []
 
 
+class TrendBodyDTO(StatsFilterBodyDTO):
+    steps: int = Field(10, ge=1, le=1000)
+    granularity: Literal["day", "week", "month", "quarter", "year"] | None = None
+    # Бюджет точек графика: ряд строится по дням и прореживается LTTB
+    max_points: int | None = Field(None, ge=3, le=10000)
+
+
 class TrendDTO(BaseModel):
     date: date
     amount_sum: float
+
+
+class TrendSeriesBodyDTO(TrendBodyDTO):
+    group_by: Literal["category", "tag", "unit"] = "category"
+    top: int | None = Field(None, ge=1, le=50)
+
+
+class TrendSeriesItemDTO(BaseModel):
+    id: UUID | None
+    name: str
+    color: str | None
+    values: list[float]
+    total: float
+
+
+class TrendSeriesDTO(BaseModel):
+    periods: list[date]
+    series: list[TrendSeriesItemDTO]
+
+
+class CategoryComparisonDTO(BaseModel):
+    category: str
+    color: str
+    current: float
+    previous: float
+    change: float
+    change_percent: float | None
+    year_ago: float
+    year_change: float
+    year_change_percent: float | None
+    avg_3: float
+    avg_6: float
+    avg_12: float
+
+
+class CategoryPercentilesDTO(BaseModel):
+    category: str
+    color: str | None
+    median: float
+    p90: float
+    count: int
+
+
+class HistogramBodyDTO(StatsFilterBodyDTO):
+    bins: int = Field(10, ge=1, le=100)
+    min_amount: float | None = None
+    max_amount: float | None = None
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        if (
+            self.min_amount is not None
+            and self.max_amount is not None
+            and self.max_amount <= self.min_amount
+        ):
+            raise ValueError("max_amount must be greater than min_amount")
+        return self
+
+
+class HistogramBinDTO(BaseModel):
+    start: float
+    end: float
+    count: int
+
+
+class HeatmapCellDTO(BaseModel):
+    category: str
+    color: str | None
+    weekday: int
+    amount_sum: float
+    count: int
+
+
+class PriceHistoryBodyDTO(StatsFilterBodyDTO):
+    name: str = Field(min_length=1, max_length=70)
+
+
+class PricePointDTO(BaseModel):
+    date: date
+    unit: str | None
+    unit_price: float
+    min_unit_price: float
+    max_unit_price: float
+    count: int
+
+
+class TopProductsBodyDTO(StatsFilterBodyDTO):
+    limit: int = Field(10, ge=1, le=100)
+
+
+class TopProductDTO(BaseModel):
+    name: str
+    amount_sum: float
+    count: int
+
+
+class CashflowPointDTO(BaseModel):
+    date: date
+    income: float
+    expense: float
+    balance: float
+
+
+class CategoryRunningTotalDTO(BaseModel):
+    id: UUID | None
+    name: str
+    color: str | None
+    record_type: str
+    values: list[float]
+
+
+class CashflowDTO(BaseModel):
+    opening_balance: float
+    points: list[CashflowPointDTO]
+    categories: list[CategoryRunningTotalDTO]
+
+
+class DashboardMonthStatDTO(BaseModel):
+    stat: Literal["categories-month-sum", "categories-month-count"]
+    record_type_name: str
+    month: int = Field(ge=1, le=12)
+    year: int = Field(ge=1900)
+
+
+class DashboardTrendStatDTO(BaseModel):
+    stat: Literal["trend"]
+    record_type_name: str
+    filters: TrendBodyDTO
+
+
+class DashboardTrendSeriesStatDTO(BaseModel):
+    stat: Literal["trend-series"]
+    record_type_name: str
+    filters: TrendSeriesBodyDTO
+
+
+DashboardStatDTO = Annotated[
+    DashboardMonthStatDTO | DashboardTrendStatDTO | DashboardTrendSeriesStatDTO,
+    Field(discriminator="stat"),
+]
+
+
+class DashboardBodyDTO(BaseModel):
+    stats: list[DashboardStatDTO] = Field(min_length=1, max_length=20)
+
+
+class DashboardResultDTO(BaseModel):
+    stat: str
+    record_type_name: str
+    data: Any
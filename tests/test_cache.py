@@ -0,0 +1,205 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+import src.cache.versions as versions
+import src.routers.base as base
+from src.cache.backends import rebuild_key
+from src.records.categories.router import ExpenseCategoryRouter
+from src.schemas import CategoryDTO
+
+
+async def test_set_get_json_roundtrip(backend):
+    value = {"items": [{"id": str(uuid.uuid4()), "amount": 1.5}], "next_cursor": None}
+    await backend.set("key", value)
+    assert await backend.get("key") == value
+    assert await backend.get("missing") is None
+
+
+async def test_set_ttl_expires(backend):
+    await backend.set("key", [1, 2], ttl=1)
+    assert await backend.get("key") == [1, 2]
+    await asyncio.sleep(1.2)
+    assert await backend.get("key") is None
+
+
+async def test_set_fractional_ttl(backend):
+    await backend.set("key", 1, ttl=0.5)
+    assert await backend.get("key") == 1
+    await asyncio.sleep(0.7)
+    assert await backend.get("key") is None
+
+
+@pytest.mark.parametrize("ttl", [0, -1, float("inf"), float("nan")])
+async def test_set_rejects_invalid_ttl(backend, ttl):
+    with pytest.raises(ValueError):
+        await backend.set("key", 1, ttl=ttl)
+    assert await backend.get("key") is None
+
+
+async def test_delete(backend):
+    await backend.set("key", 1)
+    await backend.delete("key")
+    assert await backend.get("key") is None
+
+
+async def test_incr_seeds_from_time_ns(backend):
+    before = time.time_ns()
+    version = await backend.incr("version")
+    assert version > before
+    assert await backend.incr("version") == version + 1
+    assert await backend.get_version("version") == version + 1
+
+
+async def test_incr_after_eviction_does_not_repeat(backend):
+    version = await backend.incr("version")
+    await backend.delete("version")
+    assert await backend.incr("version") > version
+
+
+async def test_get_version_creates_counter(backend):
+    version = await backend.get_version("version")
+    assert version is not None
+    assert await backend.get_version("version") == version
+
+
+async def test_adjust_missing_key_invalidates_rebuild(backend):
+    generation = await backend.get_version(rebuild_key("count"))
+    assert await backend.adjust("count", 1) is None
+    assert await backend.get("count") is None
+    assert await backend.get_version(rebuild_key("count")) == generation + 1
+
+
+async def test_adjust_keeps_ttl(backend):
+    await backend.set("count", 10, ttl=1)
+    assert await backend.adjust("count", 2) == 12
+    assert await backend.adjust("count", -3) == 9
+    assert await backend.get("count") == 9
+    await asyncio.sleep(1.2)
+    assert await backend.get("count") is None
+
+
+class FakeCategory:
+    def __init__(self, data):
+        self.dto = CategoryDTO(id=uuid.uuid4(), **data.model_dump())
+
+    def to_dto(self):
+        return self.dto
+
+
+@pytest.fixture
+def router(backend, monkeypatch):
+    """Роутер категорий с хранилищем backend и без обращений к БД"""
+    monkeypatch.setattr(base, "cache_backend", backend)
+    monkeypatch.setattr(versions, "cache_backend", backend)
+    router = ExpenseCategoryRouter()
+    router.pages = 0
+
+    async def get_page(session, current_user, limit, skip, cursor, params=None):
+        router.pages += 1
+        return [CategoryDTO(id=uuid.uuid4(), name="Еда", color="#fff")], None
+
+    async def create_base(session, data, kwargs):
+        return FakeCategory(data)
+
+    async def update_base(session, current_user, data, item_id):
+        return CategoryDTO(id=item_id, name="Еда", color="#000")
+
+    async def delete_base(session, current_user, item_id):
+        return True
+
+    monkeypatch.setattr(router, "get_page", get_page)
+    monkeypatch.setattr(router, "create_base", create_base)
+    monkeypatch.setattr(router, "update_base", update_base)
+    monkeypatch.setattr(router, "delete_base", delete_base)
+    return router
+
+
+async def list_items(router, user):
+    response = SimpleNamespace(headers={})
+    return await router.list_items(response, None, user, 100, 0, None)
+
+
+async def versions_of(router, user, backend):
+    namespace = router.get_cache_namespace(user)
+    return (
+        await backend.get_version(f"{namespace}:version"),
+        await versions.get_data_version(user.id),
+    )
+
+
+async def test_list_served_from_cache(router, user):
+    first = await list_items(router, user)
+    second = await list_items(router, user)
+    assert router.pages == 1
+    assert second == first
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda router, user: router.create({"name": "Еда", "color": "#fff"}, None, user),
+        lambda router, user: router.update(
+            uuid.uuid4(), {"name": "Еда", "color": "#000"}, None, user
+        ),
+        lambda router, user: router.delete(uuid.uuid4(), None, user),
+    ],
+    ids=["create", "update", "delete"],
+)
+async def test_change_bumps_versions(router, user, backend, change):
+    await list_items(router, user)
+    namespace_version, data_version = await versions_of(router, user, backend)
+
+    await change(router, user)
+
+    new_namespace_version, new_data_version = await versions_of(router, user, backend)
+    assert new_namespace_version > namespace_version
+    assert new_data_version > data_version
+    await list_items(router, user)
+    assert router.pages == 2
+
+
+async def test_cache_is_per_user(router, user):
+    other = SimpleNamespace(id=uuid.uuid4())
+    await list_items(router, user)
+    await list_items(router, other)
+    await router.create({"name": "Еда", "color": "#fff"}, None, other)
+    await list_items(router, user)
+    assert router.pages == 2
+
+
+@pytest.fixture
+def counts(monkeypatch):
+    """Подмена COUNT(*): количество вызовов и действие во время подсчета"""
+    counts = SimpleNamespace(calls=0, value=5, during=None)
+
+    async def count_data(session, model, filters):
+        counts.calls += 1
+        if counts.during is not None:
+            await counts.during()
+        return counts.value
+
+    monkeypatch.setattr(base, "count_data", count_data)
+    return counts
+
+
+async def test_count_adjusted_on_create_and_delete(router, user, counts):
+    assert await router.count_items(None, user) == 5
+    await router.create({"name": "Еда", "color": "#fff"}, None, user)
+    await router.create({"name": "Еда", "color": "#fff"}, None, user)
+    await router.delete(uuid.uuid4(), None, user)
+    assert await router.count_items(None, user) == 6
+    assert counts.calls == 1
+
+
+async def test_count_not_cached_when_changed_during_rebuild(router, user, counts):
+    # Создание завершается, пока идет COUNT(*), и не находит счетчика
+    counts.during = lambda: router.on_change(user, count_delta=1)
+    assert await router.count_items(None, user) == 5
+    counts.during = None
+    counts.value = 6
+    assert await router.count_items(None, user) == 6
+    assert counts.calls == 2
@@ -0,0 +1,93 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from src.stats.cashflow import ensure_checkpoints
+
+# Итоги, пересчитанные по сырым записям пользователя
+EXPECTED_TOTALS = """
+    SELECT record_type_id, category_id, record_date,
+           sum(amount::numeric), coalesce(sum(amount::numeric * product_quantity), 0),
+           count(*)
+    FROM record
+    WHERE user_id = :user_id
+    GROUP BY record_type_id, category_id, record_date
+"""
+ACTUAL_TOTALS = """
+    SELECT record_type_id, category_id, record_date,
+           amount_sum, amount_qty_sum, record_count
+    FROM daily_record_totals
+    WHERE user_id = :user_id
+"""
+
+
+async def assert_totals_match(session, user_id):
+    params = {"user_id": user_id}
+    expected = set((await session.execute(text(EXPECTED_TOTALS), params)).all())
+    actual = set((await session.execute(text(ACTUAL_TOTALS), params)).all())
+    assert actual == expected
+
+
+async def test_totals_match_seeded_records(db_session, database):
+    await assert_totals_match(db_session, database.user_id)
+
+
+async def test_totals_follow_bulk_changes(db_session, database):
+    params = {"user_id": database.user_id}
+    await db_session.execute(
+        text("UPDATE record SET amount = amount + 0.1 WHERE user_id = :user_id"), params
+    )
+    await db_session.execute(
+        text(
+            "UPDATE record SET record_date = record_date - 1 "
+            "WHERE user_id = :user_id AND product_quantity = 2"
+        ),
+        params,
+    )
+    # Изменение полей, не входящих в итоги, итоги не затрагивает
+    await db_session.execute(
+        text("UPDATE record SET name = name || '!' WHERE user_id = :user_id"), params
+    )
+    await db_session.execute(
+        text("DELETE FROM record WHERE user_id = :user_id AND product_quantity = 3"),
+        params,
+    )
+    await assert_totals_match(db_session, database.user_id)
+
+    # Строки итогов без записей удаляются
+    await db_session.execute(text("DELETE FROM record WHERE user_id = :user_id"), params)
+    assert (await db_session.execute(text(ACTUAL_TOTALS), params)).all() == []
+
+
+async def test_change_invalidates_checkpoints_from_its_month(db_session, database):
+    params = {"user_id": database.user_id}
+    target = date.today().replace(day=1)
+    await ensure_checkpoints(db_session, database.user_id, target)
+    months = (
+        await db_session.scalars(
+            text(
+                "SELECT DISTINCT month FROM balance_checkpoint "
+                "WHERE user_id = :user_id ORDER BY month"
+            ),
+            params,
+        )
+    ).all()
+    changed = months[len(months) // 2]
+
+    await db_session.execute(
+        text(
+            "UPDATE record SET amount = amount + 1 "
+            "WHERE user_id = :user_id AND record_date >= :start AND record_date < :end"
+        ),
+        {**params, "start": changed, "end": months[len(months) // 2 + 1]},
+    )
+    remaining = (
+        await db_session.scalars(
+            text(
+                "SELECT DISTINCT month FROM balance_checkpoint "
+                "WHERE user_id = :user_id ORDER BY month"
+            ),
+            params,
+        )
+    ).all()
+    assert remaining == [month for month in months if month < changed]
@@ -0,0 +1,45 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.routers.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize(
+    "value, value_type",
+    [
+        (date(2024, 1, 31), date),
+        (datetime(2024, 1, 31, 12, 30), datetime),
+        (12.5, float),
+        ("Хлеб", str),
+    ],
+)
+def test_cursor_roundtrip(value, value_type):
+    item_id = uuid.uuid4()
+    cursor = encode_cursor(value, item_id, "key")
+    assert decode_cursor(cursor, value_type, "key") == (value, item_id)
+
+
+@pytest.mark.parametrize(
+    "value, value_type",
+    [("x", float), (5, str), ("2024-13-01", date), ([1], float), ({}, datetime)],
+)
+def test_forged_cursor_value_rejected(value, value_type):
+    cursor = encode_cursor(value, uuid.uuid4(), "key")
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, value_type, "key")
+    assert error.value.status_code == 400
+
+
+def test_cursor_of_other_sort_rejected():
+    cursor = encode_cursor(12.5, uuid.uuid4(), "amount")
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, float, "-amount")
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "W10", "WzEsIngiXQ"])
+def test_malformed_cursor_rejected(cursor):
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, float)
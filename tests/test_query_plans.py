@@ -0,0 +1,20 @@
+import uuid
+
+import pytest
+
+from src.database.explain import EXPECTED_INDEXES, explain, hot_queries, used_indexes
+
+QUERIES = list(hot_queries(uuid.uuid4(), uuid.uuid4()))
+
+
+def test_every_hot_query_has_expected_indexes():
+    assert set(QUERIES) == set(EXPECTED_INDEXES)
+
+
+@pytest.mark.parametrize("name", QUERIES)
+async def test_hot_query_uses_indexes(db_session, database, name):
+    # Настройки планировщика по умолчанию: индекс должен выигрывать по
+    # стоимости на заполненной БД, а не из-за запрета Seq Scan
+    stmt = hot_queries(database.user_id, database.tag_id)[name]()
+    plan = await explain(db_session, stmt)
+    assert used_indexes(plan) & EXPECTED_INDEXES[name]
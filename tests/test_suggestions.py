@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from src.records.records.suggestions import NameSuggestions
+
+
+def name(value: str, count: int) -> dict:
+    return {"name": value, "count": count}
+
+
+class FakeSession:
+    """Сессия, отвечающая на запросы заданными списками строк по порядку"""
+
+    def __init__(self, *results: list[dict]):
+        self.results = list(results)
+        self.calls = 0
+
+    async def execute(self, stmt):
+        self.calls += 1
+        rows = self.results.pop(0)
+        return SimpleNamespace(mappings=lambda: rows)
+
+
+async def test_suggest_from_cached_names(user):
+    suggestions = NameSuggestions(10, 60, names_limit=10)
+    session = FakeSession([name("Хлебцы", 5), name("Молоко", 4), name("Хлеб", 3)])
+    result = await suggestions.suggest(session, user.id, 1, " ХЛЕБ", 10)
+    assert [item["name"] for item in result] == ["Хлебцы", "Хлеб"]
+
+    # Список полный: недостающих названий в БД нет, повторного запроса нет
+    await suggestions.suggest(session, user.id, 1, "чай", 10)
+    assert session.calls == 1
+
+
+async def test_suggest_falls_back_to_database(user):
+    suggestions = NameSuggestions(10, 60, names_limit=2)
+    session = FakeSession(
+        [name("Молоко", 9), name("Черный хлеб", 8)],
+        [name("Черный хлеб", 8), name("Белый хлеб", 2), name("Хлебцы", 1)],
+    )
+    result = await suggestions.suggest(session, user.id, 1, "хлеб", 3)
+    assert [item["name"] for item in result] == ["Черный хлеб", "Хлебцы", "Белый хлеб"]
+    assert session.calls == 2